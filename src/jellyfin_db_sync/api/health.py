@@ -7,6 +7,10 @@ from ..sync import SyncEngine
 
 router = APIRouter(tags=["health"])
 
+# Readiness probes reuse server health results up to this age (seconds),
+# so frequent Kubernetes probes don't hit every Jellyfin server each time
+READYZ_HEALTH_MAX_AGE_SECONDS = 5.0
+
 
 @router.get("/healthz")
 async def healthz() -> Response:
@@ -50,8 +54,7 @@ async def readyz(request: Request) -> Response:
             )
 
         # Check worker
-        queue_status = await engine.get_queue_status()
-        if not queue_status.get("worker_running"):
+        if not engine.worker_running:
             return Response(
                 content="worker not running",
                 status_code=503,
@@ -59,7 +62,7 @@ async def readyz(request: Request) -> Response:
             )
 
         # Check at least one server is reachable
-        server_health = await engine.health_check_all()
+        server_health = await engine.cached_health_check_all(max_age=READYZ_HEALTH_MAX_AGE_SECONDS)
         if not any(server_health.values()):
             return Response(
                 content="no servers reachable",
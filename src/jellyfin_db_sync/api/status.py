@@ -1,17 +1,25 @@
 """Status API endpoints for monitoring dashboard."""
 
-from datetime import UTC, datetime
-from typing import Any
+import asyncio
+import time
+from datetime import datetime
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Request
-from pydantic import BaseModel
+from fastapi import APIRouter, Query, Request, Response
+from pydantic import BaseModel, TypeAdapter
 
 from ..config import get_config
 from ..database import get_db
+from ..models import PendingEventStatus, SyncEventType
 from ..sync import SyncEngine
 
 router = APIRouter(prefix="/api", tags=["status"])
 
+# Upper bound for list endpoints, so a single request cannot materialize an unbounded result set
+MAX_PAGE_SIZE = 500
+
+PageLimit = Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)]
+
 
 class ServerStatus(BaseModel):
     """Status of a single Jellyfin server."""
@@ -55,6 +63,58 @@ class DatabaseStatus(BaseModel):
     database_size_bytes: int
 
 
+class EventOut(BaseModel):
+    """Queued event as listed on the dashboard.
+
+    Served with response_model_exclude_none, so optional fields are omitted when unset.
+    """
+
+    id: int | None
+    event_type: SyncEventType
+    source_server: str
+    target_server: str
+    username: str
+    item_name: str
+    status: PendingEventStatus
+    last_error: str | None = None
+    created_at: datetime
+
+
+class PendingEventOut(EventOut):
+    """Event waiting in the sync queue."""
+
+    item_path: str | None = None
+    retry_count: int
+
+
+class WaitingEventOut(EventOut):
+    """Event waiting for its item to appear on the target server."""
+
+    item_path: str | None = None
+    item_not_found_count: int
+    item_not_found_max: int
+    next_retry_at: datetime | None = None
+
+
+class FailedEventOut(EventOut):
+    """Event that exceeded max retries."""
+
+    retry_count: int
+
+
+# Event lists are validated from the rows and dumped to JSON in one pass; returning the
+# models would have FastAPI validate every row a second time against the response model
+_PENDING_EVENTS = TypeAdapter(list[PendingEventOut])
+_WAITING_EVENTS = TypeAdapter(list[WaitingEventOut])
+_FAILED_EVENTS = TypeAdapter(list[FailedEventOut])
+
+
+def _events_response(adapter: TypeAdapter[Any], events: list[Any]) -> Response:
+    """Serialize database event rows through an event list adapter."""
+    content = adapter.dump_json(adapter.validate_python(events, from_attributes=True), exclude_none=True)
+    return Response(content=content, media_type="application/json")
+
+
 class OverallStatus(BaseModel):
     """Overall system status."""
 
@@ -67,30 +127,71 @@ class OverallStatus(BaseModel):
     sync_stats: SyncStats
 
 
-# Track service start time
-_start_time: datetime | None = None
+# Service start time (monotonic clock, recorded when the API module is loaded at startup)
+_start_monotonic = time.monotonic()
+
 
+def get_uptime_seconds() -> float:
+    """Get seconds since the service started."""
+    return time.monotonic() - _start_monotonic
 
-def get_start_time() -> datetime:
-    """Get or initialize the service start time."""
-    global _start_time
-    if _start_time is None:
-        _start_time = datetime.now(UTC)
-    return _start_time
+
+def _queue_status_from_counts(counts: dict[str, int], worker_running: bool) -> QueueStatus:
+    """Build queue status from per-status event counts."""
+    processing = counts.get("processing", 0)
+    return QueueStatus(
+        # Matches get_pending_count(): events in flight still count as pending
+        pending_events=counts.get("pending", 0) + processing,
+        processing_events=processing,
+        waiting_for_item_events=counts.get("waiting_for_item", 0),
+        failed_events=counts.get("failed", 0),
+        worker_running=worker_running,
+    )
 
 
 @router.get("/status", response_model=OverallStatus)
 async def get_status(request: Request) -> OverallStatus:
-    """Get comprehensive system status for the dashboard."""
+    """Get comprehensive system status for the dashboard.
+
+    Concurrent requests (e.g. several dashboard tabs refreshing at once) share a
+    single computation instead of each running the full fan-out. The in-flight task
+    lives on app state, so it belongs to this app and its event loop.
+    """
+    state = request.app.state
+    inflight: asyncio.Task[OverallStatus] | None = getattr(state, "status_inflight", None)
+    if inflight is None or inflight.done():
+        inflight = asyncio.create_task(_build_status(state.engine))
+        state.status_inflight = inflight
+    # Shield so a disconnecting client doesn't cancel the computation for the others
+    return await asyncio.shield(inflight)
+
+
+async def _build_status(engine: SyncEngine) -> OverallStatus:
+    """Collect server, queue, database and sync statistics."""
     config = get_config()
-    engine: SyncEngine = request.app.state.engine
     db = await get_db()
 
-    # Server health and info
-    server_health = await engine.health_check_all()
-    server_versions = await engine.get_server_versions()
+    # Server probes and DB reads are independent, so run them concurrently
+    # (server probes nested in their own gather to stay within gather's typed arities)
+    (
+        (server_health, server_versions),
+        event_counts,
+        table_counts,
+        item_cache_by_server,
+        sync_stats_data,
+        database_size_bytes,
+    ) = await asyncio.gather(
+        asyncio.gather(engine.cached_health_check_all(), engine.get_server_versions()),
+        db.get_event_counts(),
+        db.get_table_counts(),
+        db.get_item_cache_stats(),
+        db.get_sync_stats(),
+        db.get_database_size(),
+    )
+
+    # Server health and info (values come from config and probes, so skip validation)
     servers = [
-        ServerStatus(
+        ServerStatus.model_construct(
             name=s.name,
             url=s.url,
             passwordless=s.passwordless,
@@ -101,30 +202,21 @@ async def get_status(request: Request) -> OverallStatus:
     ]
 
     # Queue status
-    queue_info = await engine.get_queue_status()
-    queue = QueueStatus(
-        pending_events=queue_info.get("pending_events", 0),
-        processing_events=await db.get_processing_count(),
-        waiting_for_item_events=await db.get_waiting_for_item_count(),
-        failed_events=await db.get_failed_count(),
-        worker_running=queue_info.get("worker_running", False),
-    )
+    queue = _queue_status_from_counts(event_counts, engine.worker_running)
 
     # Database stats
-    item_cache_by_server = await db.get_item_cache_stats()
     item_cache_total = sum(item_cache_by_server.values())
     db_status = DatabaseStatus(
         connected=db._db is not None,
-        user_mappings_count=await db.get_user_mappings_count(),
+        user_mappings_count=table_counts.get("user_mappings", 0),
         pending_events_count=queue.pending_events,
-        sync_log_entries=await db.get_sync_log_count(),
+        sync_log_entries=table_counts.get("sync_log", 0),
         item_cache_total=item_cache_total,
         item_cache_by_server=item_cache_by_server,
-        database_size_bytes=db.get_database_size(),
+        database_size_bytes=database_size_bytes,
     )
 
     # Sync stats
-    sync_stats_data = await db.get_sync_stats()
     total = sync_stats_data.get("total", 0)
     successful = sync_stats_data.get("successful", 0)
     failed = sync_stats_data.get("failed", 0)
@@ -136,8 +228,9 @@ async def get_status(request: Request) -> OverallStatus:
     )
 
     # Overall status
-    all_servers_healthy = all(s.healthy for s in servers)
-    any_server_healthy = any(s.healthy for s in servers)
+    healthy_count = sum(s.healthy for s in servers)
+    all_servers_healthy = healthy_count == len(servers)
+    any_server_healthy = healthy_count > 0
 
     if all_servers_healthy and queue.worker_running and db_status.connected:
         status = "healthy"
@@ -146,12 +239,9 @@ async def get_status(request: Request) -> OverallStatus:
     else:
         status = "unhealthy"
 
-    start_time = get_start_time()
-    uptime = (datetime.now(UTC) - start_time).total_seconds()
-
     return OverallStatus(
         status=status,
-        uptime_seconds=uptime,
+        uptime_seconds=get_uptime_seconds(),
         version="0.0.8",
         servers=servers,
         queue=queue,
@@ -166,11 +256,13 @@ async def get_servers(request: Request) -> list[ServerStatus]:
     config = get_config()
     engine: SyncEngine = request.app.state.engine
 
-    server_health = await engine.health_check_all()
-    server_versions = await engine.get_server_versions()
+    server_health, server_versions = await asyncio.gather(
+        engine.cached_health_check_all(),
+        engine.get_server_versions(),
+    )
 
     return [
-        ServerStatus(
+        ServerStatus.model_construct(
             name=s.name,
             url=s.url,
             passwordless=s.passwordless,
@@ -187,88 +279,31 @@ async def get_queue(request: Request) -> QueueStatus:
     engine: SyncEngine = request.app.state.engine
     db = await get_db()
 
-    queue_info = await engine.get_queue_status()
+    return _queue_status_from_counts(await db.get_event_counts(), engine.worker_running)
 
-    return QueueStatus(
-        pending_events=queue_info.get("pending_events", 0),
-        processing_events=await db.get_processing_count(),
-        waiting_for_item_events=await db.get_waiting_for_item_count(),
-        failed_events=await db.get_failed_count(),
-        worker_running=queue_info.get("worker_running", False),
-    )
 
-
-@router.get("/events/pending")
-async def get_pending_events(limit: int = 50) -> list[dict[str, Any]]:
+@router.get("/events/pending", response_model=list[PendingEventOut], response_model_exclude_none=True)
+async def get_pending_events(limit: PageLimit = 50) -> Response:
     """Get list of pending events."""
     db = await get_db()
     events = await db.get_pending_events(limit=limit)
-
-    return [
-        {
-            "id": e.id,
-            "event_type": e.event_type.value,
-            "source_server": e.source_server,
-            "target_server": e.target_server,
-            "username": e.username,
-            "item_name": e.item_name,
-            "item_path": e.item_path,
-            "status": e.status.value,
-            "retry_count": e.retry_count,
-            "last_error": e.last_error,
-            "created_at": e.created_at.isoformat(),
-        }
-        for e in events
-    ]
+    return _events_response(_PENDING_EVENTS, events)
 
 
-@router.get("/events/waiting")
-async def get_waiting_events(limit: int = 50) -> list[dict[str, Any]]:
+@router.get("/events/waiting", response_model=list[WaitingEventOut], response_model_exclude_none=True)
+async def get_waiting_events(limit: PageLimit = 50) -> Response:
     """Get list of events waiting for items to be imported."""
     db = await get_db()
     events = await db.get_waiting_for_item_events(limit=limit)
+    return _events_response(_WAITING_EVENTS, events)
 
-    return [
-        {
-            "id": e.id,
-            "event_type": e.event_type.value,
-            "source_server": e.source_server,
-            "target_server": e.target_server,
-            "username": e.username,
-            "item_name": e.item_name,
-            "item_path": e.item_path,
-            "status": e.status.value,
-            "item_not_found_count": e.item_not_found_count,
-            "item_not_found_max": e.item_not_found_max,
-            "last_error": e.last_error,
-            "next_retry_at": e.next_retry_at.isoformat() if e.next_retry_at else None,
-            "created_at": e.created_at.isoformat(),
-        }
-        for e in events
-    ]
 
-
-@router.get("/events/failed")
-async def get_failed_events(limit: int = 50) -> list[dict[str, Any]]:
+@router.get("/events/failed", response_model=list[FailedEventOut], response_model_exclude_none=True)
+async def get_failed_events(limit: PageLimit = 50) -> Response:
     """Get list of failed events that exceeded max retries."""
     db = await get_db()
     events = await db.get_failed_events(limit=limit)
-
-    return [
-        {
-            "id": e.id,
-            "event_type": e.event_type.value,
-            "source_server": e.source_server,
-            "target_server": e.target_server,
-            "username": e.username,
-            "item_name": e.item_name,
-            "status": e.status.value,
-            "retry_count": e.retry_count,
-            "last_error": e.last_error,
-            "created_at": e.created_at.isoformat(),
-        }
-        for e in events
-    ]
+    return _events_response(_FAILED_EVENTS, events)
 
 
 @router.post("/events/{event_id}/retry")
@@ -285,24 +320,26 @@ async def retry_event(event_id: int) -> dict[str, Any]:
 
 @router.get("/sync-log")
 async def get_sync_log(
-    limit: int = 50,
-    offset: int = 0,
+    limit: PageLimit = 50,
+    offset: Annotated[int, Query(ge=0)] = 0,
     since_minutes: int | None = None,
     source_server: str | None = None,
     target_server: str | None = None,
     event_type: str | None = None,
     item_name: str | None = None,
+    item_name_prefix: bool = False,
 ) -> dict[str, Any]:
     """Get recent sync log entries with optional filtering and pagination.
 
     Args:
-        limit: Maximum number of entries to return (page size)
+        limit: Maximum number of entries to return (page size, at most MAX_PAGE_SIZE)
         offset: Number of entries to skip (for pagination)
         since_minutes: Only return entries from the last N minutes (default: all)
         source_server: Filter by source server name (exact match)
         target_server: Filter by target server name (exact match)
         event_type: Filter by event type (exact match)
         item_name: Filter by item name (case-insensitive substring search)
+        item_name_prefix: Match item_name as a prefix instead (indexed, faster on large logs)
 
     Returns:
         Object with entries list and pagination info
@@ -316,6 +353,7 @@ async def get_sync_log(
         target_server=target_server,
         event_type=event_type,
         item_name=item_name,
+        item_name_prefix=item_name_prefix,
     )
 
     return {
@@ -332,26 +370,19 @@ async def get_user_mappings(request: Request) -> dict[str, Any]:
     config = get_config()
     db = await get_db()
 
-    # Get all servers
-    server_names = [s.name for s in config.servers]
-
-    # Get all user mappings
-    mappings = await db.get_all_user_mappings()
+    server_names = config.server_names
+    empty_row: dict[str, str | None] = dict.fromkeys(server_names)
 
-    # Group by username
-    users: dict[str, dict[str, str | None]] = {}
-    for m in mappings:
-        if m.username not in users:
-            users[m.username] = dict.fromkeys(server_names, None)
-        users[m.username][m.server_name] = m.jellyfin_user_id
+    # One row per user, already grouped and sorted by the database
+    users = await db.get_user_server_ids()
 
     return {
         "servers": server_names,
         "users": [
             {
                 "username": username,
-                "servers": servers,
+                "servers": {**empty_row, **server_ids},
             }
-            for username, servers in sorted(users.items())
+            for username, server_ids in users
         ],
     }
@@ -1,13 +1,17 @@
 """Webhook receiver for Jellyfin events."""
 
+import asyncio
+import hashlib
 import logging
 import secrets
 import string
-from typing import Any
+from typing import Any, NamedTuple
 
 from fastapi import APIRouter, HTTPException, Request
+from pydantic_core import from_json
 
-from ..config import get_config
+from ..cache import TTLCache
+from ..config import ServerConfig, get_config
 from ..database import get_db
 from ..jellyfin import JellyfinClient
 from ..models import WebhookPayload
@@ -18,10 +22,114 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/webhook", tags=["webhook"])
 
 
+PASSWORD_ALPHABET = string.ascii_letters + string.digits + "!@#$%^&*"
+# Bytes at or above this value are rejected so every character is equally likely
+_PASSWORD_BYTE_LIMIT = 256 - 256 % len(PASSWORD_ALPHABET)
+
+
 def generate_random_password(length: int = 16) -> str:
-    """Generate a random password for new users on password-required servers."""
-    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+    """Generate a random password for new users on password-required servers.
+
+    Draws random bytes in bulk (one urandom call for typical lengths) and maps
+    them onto the alphabet with rejection sampling.
+    """
+    chars: list[str] = []
+    while len(chars) < length:
+        # Oversample: ~18% of bytes are rejected for a 70-char alphabet
+        for byte in secrets.token_bytes(2 * (length - len(chars))):
+            if byte < _PASSWORD_BYTE_LIMIT:
+                chars.append(PASSWORD_ALPHABET[byte % len(PASSWORD_ALPHABET)])
+                if len(chars) == length:
+                    break
+    return "".join(chars)
+
+
+class ItemIdentity(NamedTuple):
+    """Item fields used for cross-server matching."""
+
+    path: str | None
+    imdb: str | None
+    tmdb: str | None
+    tvdb: str | None
+
+
+# Enrichment lookups keyed by (server_name, item_id)
+# Playback webhooks repeat for the same item, so most lookups are cache hits.
+# Item paths rarely change; entries are also dropped when the item is deleted.
+ITEM_INFO_CACHE_MAXSIZE = 10_000
+ITEM_INFO_CACHE_TTL_SECONDS = 6 * 60 * 60.0
+_item_info_cache: TTLCache[tuple[str, str], ItemIdentity] = TTLCache(
+    maxsize=ITEM_INFO_CACHE_MAXSIZE, ttl=ITEM_INFO_CACHE_TTL_SECONDS
+)
+
+
+async def get_item_identity(client: JellyfinClient, user_id: str, item_id: str) -> ItemIdentity | None:
+    """Get path and provider IDs of an item, cached per server. Failed lookups are not cached."""
+    key = (client.server.name, item_id)
+    identity = _item_info_cache.get(key)
+    if identity is not None:
+        return identity
+
+    item_info = await client.get_item_info(user_id, item_id)
+    if not item_info:
+        return None
+
+    provider_ids = item_info.get("ProviderIds", {})
+    identity = ItemIdentity(
+        path=item_info.get("Path"),
+        imdb=provider_ids.get("Imdb"),
+        tmdb=provider_ids.get("Tmdb"),
+        tvdb=provider_ids.get("Tvdb"),
+    )
+    _item_info_cache.set(key, identity)
+    return identity
+
+
+# Jellyfin re-sends identical webhooks (e.g. ItemAdded) within seconds. Only the last body
+# per (server, user, item, event) is remembered, so a delivery is dropped only when it
+# repeats the one right before it; toggles such as played -> unplayed -> played all apply
+WEBHOOK_DEDUP_CACHE_MAXSIZE = 4096
+WEBHOOK_DEDUP_TTL_SECONDS = 10.0
+_recent_webhooks: TTLCache[tuple[str, str, str, str], bytes] = TTLCache(
+    maxsize=WEBHOOK_DEDUP_CACHE_MAXSIZE, ttl=WEBHOOK_DEDUP_TTL_SECONDS
+)
+
+
+# Keys WebhookPayload accepts for the username (alias and field name)
+_USERNAME_KEYS = (b'"NotificationUsername"', b'"username"')
+
+
+def get_username_skip_reason(body: bytes) -> str | None:
+    """Get the skip reason for a webhook body without a username, before full validation.
+
+    Bodies that mention a username key, are not a JSON object, or have a non-string
+    event return None and go through normal validation. A username-less body is
+    skipped whatever its other fields hold: it is acknowledged (200) without being
+    validated, even if validation would have rejected it with a 400.
+    """
+    if any(key in body for key in _USERNAME_KEYS):
+        return None
+
+    try:
+        data = from_json(body)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    event = data.get("NotificationType", data.get("event", ""))
+    if not isinstance(event, str) or event == "ItemDeleted":
+        return None
+    if event == "UserCreated":
+        return "missing user info"
+    if event == "UserDeleted":
+        return "missing username"
+    return "no username"
+
+
+def forget_item_identity(server_name: str, item_id: str) -> None:
+    """Drop a cached item identity, e.g. after the item was deleted."""
+    _item_info_cache.pop((server_name, item_id))
 
 
 def get_engine(request: Request) -> SyncEngine:
@@ -32,12 +140,14 @@ def get_engine(request: Request) -> SyncEngine:
     return engine
 
 
-async def sync_user_creation(source_server: str, username: str, user_id: str) -> dict[str, Any]:
+async def sync_user_creation(engine: SyncEngine, source_server: str, username: str, user_id: str) -> dict[str, Any]:
     """
     Create user on all other servers when a user is created.
 
     - Passwordless servers: create without password
     - Password servers: create with random password (user must reset)
+
+    Servers are handled concurrently; one slow or failing server does not delay the others.
     """
     config = get_config()
     db = await get_db()
@@ -45,60 +155,52 @@ async def sync_user_creation(source_server: str, username: str, user_id: str) ->
 
     logger.info("[%s] Syncing user creation: %s", source_server, username)
 
-    # Save mapping for source server
-    await db.upsert_user_mapping(
-        username=username.lower(),
-        server_name=source_server,
-        jellyfin_user_id=user_id,
-    )
-
-    # Create on other servers
-    for server in config.servers:
-        if server.name == source_server:
-            continue
+    # Mappings are keyed by lowercase username
+    username_lc = username.lower()
+    # Mappings are collected and written in one transaction once all servers are done
+    mappings: list[tuple[str, str, str]] = [(username_lc, source_server, user_id)]
 
-        client = JellyfinClient(server)
+    async def _handle_one(server: ServerConfig) -> tuple[str, Any]:
+        client = engine.get_client(server)
 
-        # Check if user already exists
-        existing = await client.get_user_by_name(username)
-        if existing:
-            logger.debug("[%s] User '%s' already exists, updating mapping", server.name, username)
-            # Update mapping anyway
-            await db.upsert_user_mapping(
-                username=username.lower(),
-                server_name=server.name,
-                jellyfin_user_id=existing["Id"],
-            )
-            results["skipped"].append(server.name)
-            continue
-
-        # Determine password
+        # Determine password (only used if the user doesn't exist yet)
         password = None if server.passwordless else generate_random_password()
 
-        # Create user
-        new_user = await client.create_user(username, password)
-        if new_user:
-            logger.info(
-                "[%s] Created user '%s' (passwordless=%s)",
-                server.name,
-                username,
-                server.passwordless,
-            )
-            await db.upsert_user_mapping(
-                username=username.lower(),
-                server_name=server.name,
-                jellyfin_user_id=new_user["Id"],
-            )
-            results["created"].append(
-                {
-                    "server": server.name,
-                    "passwordless": server.passwordless,
-                    "password": password,  # Return so admin can share if needed
-                }
-            )
-        else:
+        # Create user, or pick up the existing one (one request unless the name is taken)
+        user, created = await client.ensure_user(username, password)
+        if not user:
             logger.error("[%s] Failed to create user '%s'", server.name, username)
+            return "failed", server.name
+
+        mappings.append((username_lc, server.name, user["Id"]))
+        if not created:
+            logger.debug("[%s] User '%s' already exists, updating mapping", server.name, username)
+            return "skipped", server.name
+
+        logger.info(
+            "[%s] Created user '%s' (passwordless=%s)",
+            server.name,
+            username,
+            server.passwordless,
+        )
+        return "created", {
+            "server": server.name,
+            "passwordless": server.passwordless,
+            "password": password,  # Return so admin can share if needed
+        }
+
+    # Create on other servers
+    targets = config.get_other_servers(source_server)
+    outcomes = await asyncio.gather(*(_handle_one(server) for server in targets), return_exceptions=True)
+    for server, outcome in zip(targets, outcomes, strict=True):
+        if isinstance(outcome, BaseException):
+            logger.error("[%s] Failed to create user '%s': %s", server.name, username, outcome)
             results["failed"].append(server.name)
+        else:
+            key, value = outcome
+            results[key].append(value)
+
+    await db.upsert_user_mappings(mappings)
 
     logger.info(
         "User sync complete: %s - created=%d, skipped=%d, failed=%d",
@@ -110,43 +212,52 @@ async def sync_user_creation(source_server: str, username: str, user_id: str) ->
     return results
 
 
-async def sync_user_deletion(source_server: str, username: str) -> dict[str, Any]:
-    """Delete user from all servers when deleted from one."""
+async def sync_user_deletion(engine: SyncEngine, source_server: str, username: str) -> dict[str, Any]:
+    """Delete user from all servers when deleted from one (servers handled concurrently)."""
     config = get_config()
     db = await get_db()
     results: dict[str, Any] = {"deleted": [], "not_found": [], "failed": []}
 
     logger.info("[%s] Syncing user deletion: %s", source_server, username)
 
-    # Delete mapping for source server
-    await db.delete_user_mapping(username=username.lower(), server_name=source_server)
+    # Mappings are keyed by lowercase username
+    username_lc = username.lower()
+    # Mappings to remove are collected and deleted in one transaction once all servers are done
+    mappings: list[tuple[str, str]] = [(username_lc, source_server)]
     results["deleted"].append(source_server)
 
-    # Delete from other servers
-    for server in config.servers:
-        if server.name == source_server:
-            continue
-
-        client = JellyfinClient(server)
+    async def _handle_one(server: ServerConfig) -> str:
+        client = engine.get_client(server)
 
         # Find user
         user = await client.get_user_by_name(username)
         if not user:
             logger.debug("[%s] User '%s' not found, removing mapping", server.name, username)
-            results["not_found"].append(server.name)
             # Still remove mapping if exists
-            await db.delete_user_mapping(username=username.lower(), server_name=server.name)
-            continue
+            mappings.append((username_lc, server.name))
+            return "not_found"
 
         # Delete user
         success = await client.delete_user(user["Id"])
-        if success:
-            logger.info("[%s] Deleted user '%s'", server.name, username)
-            await db.delete_user_mapping(username=username.lower(), server_name=server.name)
-            results["deleted"].append(server.name)
-        else:
+        if not success:
             logger.error("[%s] Failed to delete user '%s'", server.name, username)
+            return "failed"
+
+        logger.info("[%s] Deleted user '%s'", server.name, username)
+        mappings.append((username_lc, server.name))
+        return "deleted"
+
+    # Delete from other servers
+    targets = config.get_other_servers(source_server)
+    outcomes = await asyncio.gather(*(_handle_one(server) for server in targets), return_exceptions=True)
+    for server, outcome in zip(targets, outcomes, strict=True):
+        if isinstance(outcome, BaseException):
+            logger.error("[%s] Failed to delete user '%s': %s", server.name, username, outcome)
             results["failed"].append(server.name)
+        else:
+            results[outcome].append(server.name)
+
+    await db.delete_user_mappings(mappings)
 
     logger.info(
         "User deletion complete: %s - deleted=%d, not_found=%d, failed=%d",
@@ -162,6 +273,7 @@ async def sync_user_deletion(source_server: str, username: str) -> dict[str, Any
 async def receive_webhook(
     server_name: str,
     request: Request,
+    await_enqueue: bool = False,
 ) -> dict[str, Any]:
     """
     Receive webhook from a Jellyfin server.
@@ -171,7 +283,12 @@ async def receive_webhook(
 
     Where {server_name} matches the name in config.yaml
 
-    The webhook is enqueued for async processing (WAL pattern).
+    Identical deliveries for the same server within WEBHOOK_DEDUP_TTL_SECONDS are
+    acknowledged with status "deduped" and not processed again.
+
+    The webhook is accepted into the engine's in-memory inbox and written to the
+    queue in the background (WAL pattern); 503 is returned when the inbox is full.
+    Pass ?await_enqueue=true to wait for the queue write and get the event count.
     """
     config = get_config()
 
@@ -183,18 +300,43 @@ async def receive_webhook(
 
     # Parse the webhook payload
     try:
-        body = await request.json()
-        logger.debug("[RAW WEBHOOK] %s: %s", server_name, body)
-        payload = WebhookPayload.model_validate(body)
+        # Parse and validate the raw bytes in one pass (no intermediate dict)
+        body = await request.body()
+        if logger.isEnabledFor(logging.DEBUG):
+            # Decoding a large body is not free; skip it entirely unless DEBUG is on
+            logger.debug("[RAW WEBHOOK] %s: %s", server_name, body.decode(errors="replace"))
+
+        # Can't sync without knowing the user; skip before building the full model
+        skip_reason = get_username_skip_reason(body)
+        if skip_reason:
+            logger.debug("[%s] Skipping webhook: %s", server_name, skip_reason)
+            return {"status": "skipped", "reason": skip_reason}
+
+        payload = WebhookPayload.model_validate_json(body)
     except Exception as e:
         logger.error("Failed to parse webhook payload: %s", e)
         raise HTTPException(status_code=400, detail="Invalid webhook payload") from e
 
+    dedup_key = (server_name, payload.user_id or payload.username, payload.item_id, payload.event)
+    body_digest = hashlib.blake2b(body, digest_size=16).digest()
+    if _recent_webhooks.get(dedup_key) == body_digest:
+        logger.debug("[%s] Dropping duplicate webhook delivery", server_name)
+        return {"status": "deduped"}
+
+    engine = get_engine(request)
+
+    # Deleted items can't be synced, but their cached identity must not outlive them
+    if payload.event == "ItemDeleted":
+        if payload.item_id:
+            forget_item_identity(server_name, payload.item_id)
+        return {"status": "skipped", "reason": "item deleted"}
+
     # Handle user lifecycle events (sync to all servers)
     if payload.event == "UserCreated":
         if payload.username and payload.user_id:
             logger.info("[%s] UserCreated webhook: %s", server_name, payload.username)
-            results = await sync_user_creation(server_name, payload.username, payload.user_id)
+            results = await sync_user_creation(engine, server_name, payload.username, payload.user_id)
+            _recent_webhooks.set(dedup_key, body_digest)
             return {
                 "status": "user_synced",
                 "username": payload.username,
@@ -206,7 +348,8 @@ async def receive_webhook(
     if payload.event == "UserDeleted":
         if payload.username:
             logger.info("[%s] UserDeleted webhook: %s", server_name, payload.username)
-            results = await sync_user_deletion(server_name, payload.username)
+            results = await sync_user_deletion(engine, server_name, payload.username)
+            _recent_webhooks.set(dedup_key, body_digest)
             return {
                 "status": "user_deleted_all",
                 "username": payload.username,
@@ -223,28 +366,34 @@ async def receive_webhook(
     # If Path is missing, fetch it from Jellyfin API
     # The webhook plugin doesn't include Path, but we need it for reliable item matching
     if not payload.item_path and payload.item_id and payload.user_id:
-        client = JellyfinClient(server)
-        item_info = await client.get_item_info(payload.user_id, payload.item_id)
-        if item_info:
-            payload.item_path = item_info.get("Path")
+        identity = await get_item_identity(engine.get_client(server), payload.user_id, payload.item_id)
+        if identity:
+            payload.item_path = identity.path
             # Also fill in provider IDs if missing
-            provider_ids = item_info.get("ProviderIds", {})
             if not payload.provider_imdb:
-                payload.provider_imdb = provider_ids.get("Imdb")
+                payload.provider_imdb = identity.imdb
             if not payload.provider_tmdb:
-                payload.provider_tmdb = provider_ids.get("Tmdb")
+                payload.provider_tmdb = identity.tmdb
             if not payload.provider_tvdb:
-                payload.provider_tvdb = provider_ids.get("Tvdb")
-            logger.debug(
-                "[%s] Enriched from API: path=%s, imdb=%s",
-                server_name,
-                payload.item_path[-50:] if payload.item_path else None,
-                payload.provider_imdb,
-            )
+                payload.provider_tvdb = identity.tvdb
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[%s] Enriched from API: path=%s, imdb=%s",
+                    server_name,
+                    payload.item_path[-50:] if payload.item_path else None,
+                    payload.provider_imdb,
+                )
+
+    if not await_enqueue:
+        # Acknowledge immediately; the engine writes to the queue in the background
+        if not engine.submit_events(payload, server_name):
+            raise HTTPException(status_code=503, detail="Webhook inbox full, retry later")
+        _recent_webhooks.set(dedup_key, body_digest)
+        return {"status": "accepted"}
 
     # Enqueue events for async processing (WAL pattern)
-    engine = get_engine(request)
     enqueued_count = await engine.enqueue_events(payload, server_name)
+    _recent_webhooks.set(dedup_key, body_digest)
 
     if enqueued_count > 0:
         logger.info(
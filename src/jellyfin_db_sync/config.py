@@ -1,14 +1,23 @@
 """Configuration models for jellyfin-db-sync."""
 
 from pathlib import Path
+from typing import Any
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+# libyaml's C loader when available, otherwise the pure-Python one
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader  # type: ignore[assignment]
 
 
 class ServerConfig(BaseModel):
     """Configuration for a single Jellyfin server."""
 
+    model_config = {"frozen": True}
+
     name: str
     url: str
     api_key: str
@@ -31,6 +40,8 @@ class SyncConfig(BaseModel):
     progress_debounce_seconds: int = 30
     worker_interval_seconds: float = 5.0
     max_retries: int = 5
+    inbox_max_size: int = 1000  # Webhooks accepted but not yet written to the queue (503 when full)
+    per_server_concurrency: int = Field(default=10, ge=1)  # Max in-flight API requests per Jellyfin server
     dry_run: bool = False  # Prevent API calls to target servers (webhooks still enqueued)
 
 
@@ -39,6 +50,13 @@ class DatabaseConfig(BaseModel):
 
     path: str = "/data/jellyfin-db-sync.db"
     journal_mode: str = "WAL"  # WAL, DELETE, TRUNCATE, MEMORY, OFF
+    # None = auto: NORMAL with WAL (safe there, no fsync per commit), SQLite default (FULL) otherwise
+    synchronous: str | None = None  # OFF, NORMAL, FULL, EXTRA
+    cache_size_kib: int = 65536  # Page cache per connection
+    # None = auto: 256 MiB with WAL, disabled otherwise (mmap is unsafe on network filesystems)
+    mmap_size: int | None = None
+    busy_timeout_ms: int = 5000  # Wait this long for a lock instead of failing with "database is locked"
+    reader_connections: int = 2  # Read-only connections for status queries and item lookups (WAL only, 0 = disabled)
 
 
 class ServerSettings(BaseModel):
@@ -46,6 +64,9 @@ class ServerSettings(BaseModel):
 
     host: str = "0.0.0.0"
     port: int = 8080
+    loop: str = "auto"  # auto, uvloop, asyncio (auto picks uvloop when installed)
+    http: str = "auto"  # auto, httptools, h11 (auto picks httptools when installed)
+    profiling: bool = False  # Profile requests sent with X-Profile header (needs the 'profiling' extra)
 
 
 class LoggingConfig(BaseModel):
@@ -61,57 +82,87 @@ class PathSyncPolicy(BaseModel):
     Useful when libraries are still being imported.
     """
 
+    model_config = {"frozen": True}
+
     prefix: str  # Path prefix to match (e.g., /mnt/nfs/movies)
     absent_retry_count: int = 0  # -1 = infinite, 0 = no retry, >0 = specific count
     retry_delay_seconds: int = 300  # Delay between retries (5 min default)
 
 
 class Config(BaseModel):
-    """Root configuration model."""
+    """Root configuration model.
+
+    Frozen, with servers and path policies held in tuples of frozen models, so the
+    lookup tables built from them after validation can never go stale.
+    """
+
+    model_config = {"frozen": True}
 
-    servers: list[ServerConfig] = Field(default_factory=list)
+    servers: tuple[ServerConfig, ...] = ()
     sync: SyncConfig = Field(default_factory=SyncConfig)
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
     server: ServerSettings = Field(default_factory=ServerSettings)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
-    path_sync_policy: list[PathSyncPolicy] = Field(default_factory=list)
+    path_sync_policy: tuple[PathSyncPolicy, ...] = ()
+
+    # Lookup tables derived from `servers` and `path_sync_policy`, built once after validation
+    _servers_by_name: dict[str, ServerConfig] = PrivateAttr(default_factory=dict)
+    _server_names: tuple[str, ...] = PrivateAttr(default=())
+    _other_servers: dict[str, tuple[ServerConfig, ...]] = PrivateAttr(default_factory=dict)
+    _policies_longest_first: tuple[PathSyncPolicy, ...] = PrivateAttr(default=())
+    _policy_prefixes: tuple[str, ...] = PrivateAttr(default=())
+
+    def model_post_init(self, context: Any, /) -> None:
+        """Build server and path policy lookup tables."""
+        self._servers_by_name = {s.name: s for s in self.servers}
+        self._server_names = tuple(s.name for s in self.servers)
+        self._other_servers = {s.name: tuple(o for o in self.servers if o.name != s.name) for s in self.servers}
+        # Stable sort: among equal-length prefixes the first configured policy wins
+        # Empty prefixes never match, so they are left out
+        self._policies_longest_first = tuple(
+            sorted((p for p in self.path_sync_policy if p.prefix), key=lambda p: -len(p.prefix))
+        )
+        self._policy_prefixes = tuple(p.prefix for p in self._policies_longest_first)
+
+    @property
+    def server_names(self) -> tuple[str, ...]:
+        """Names of all configured servers, in config order."""
+        return self._server_names
 
     @classmethod
     def from_yaml(cls, path: str | Path) -> "Config":
         """Load configuration from a YAML file."""
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=SafeLoader)
         return cls.model_validate(data or {})
 
     def get_server(self, name: str) -> ServerConfig | None:
         """Get server config by name."""
-        for server in self.servers:
-            if server.name == name:
-                return server
-        return None
+        return self._servers_by_name.get(name)
 
-    def get_other_servers(self, exclude_name: str) -> list[ServerConfig]:
+    def get_other_servers(self, exclude_name: str) -> tuple[ServerConfig, ...]:
         """Get all servers except the specified one."""
-        return [s for s in self.servers if s.name != exclude_name]
+        others = self._other_servers.get(exclude_name)
+        return others if others is not None else self.servers
 
     def get_path_policy(self, path: str | None) -> PathSyncPolicy | None:
         """Get the path sync policy for a given path (longest prefix match)."""
-        if not path:
+        # Most paths match no policy; a single startswith over all prefixes rules that out
+        if not path or not path.startswith(self._policy_prefixes):
             return None
 
-        matching_policy: PathSyncPolicy | None = None
-        max_prefix_len = 0
-
-        for policy in self.path_sync_policy:
-            if path.startswith(policy.prefix) and len(policy.prefix) > max_prefix_len:
-                matching_policy = policy
-                max_prefix_len = len(policy.prefix)
+        # Policies are sorted longest prefix first, so the first match is the longest
+        for policy in self._policies_longest_first:
+            if path.startswith(policy.prefix):
+                return policy
 
-        return matching_policy
+        return None
 
 
 # Global config instance
 _config: Config | None = None
+# (resolved path, mtime_ns) the global config was loaded from
+_config_source: tuple[Path, int] | None = None
 
 
 def get_config() -> Config:
@@ -122,7 +173,17 @@ def get_config() -> Config:
 
 
 def load_config(path: str | Path) -> Config:
-    """Load configuration from file and set as global."""
-    global _config
-    _config = Config.from_yaml(path)
+    """Load configuration from file and set as global.
+
+    Reloading an unchanged file (same path and modification time) reuses the
+    already loaded config instead of parsing it again.
+    """
+    global _config, _config_source
+    resolved = Path(path).resolve()
+    source = (resolved, resolved.stat().st_mtime_ns)
+    if _config is not None and _config_source == source:
+        return _config
+
+    _config = Config.from_yaml(resolved)
+    _config_source = source
     return _config
@@ -1,18 +1,223 @@
 """SQLite database operations for user mappings and event queue."""
 
+import asyncio
 import contextlib
+import itertools
 import json
 import logging
+import sqlite3
+import time
+from collections.abc import AsyncIterator, Sequence
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
+from typing import Any
 
 import aiosqlite
+from pydantic_core import to_json
 
-from .config import get_config
+from .cache import TTLCache
+from .config import DatabaseConfig, get_config
 from .models import PendingEvent, PendingEventStatus, SyncEventType, UserMapping
 
 logger = logging.getLogger(__name__)
 
+# User mappings looked up per (username, server); they rarely change and every write goes
+# through this class, so cached entries are updated or dropped on write rather than expired
+USER_MAPPING_CACHE_MAXSIZE = 1024
+
+# Item IDs looked up per (server, path) while syncing; same write-through scheme as user mappings
+ITEM_PATH_CACHE_MAXSIZE = 10_000
+
+# Prepared statements kept per connection by sqlite3, keyed by SQL text. Every query here
+# uses a fixed SQL string with bound parameters, so each is prepared once per connection;
+# the size leaves room for the filter combinations of get_recent_sync_log.
+STATEMENT_CACHE_SIZE = 256
+
+# Max number of queued sync_log rows written per commit by the background writer
+SYNC_LOG_BATCH_SIZE = 500
+
+# Max time to wait for queued sync_log rows to be written on close (seconds)
+SYNC_LOG_DRAIN_TIMEOUT_SECONDS = 10.0
+
+# How long get_database_size results are reused (seconds); the dashboard polls /status
+DATABASE_SIZE_CACHE_TTL_SECONDS = 1.0
+
+# Insert used by add_pending_event and add_pending_events; shared so both hit one prepared statement
+INSERT_PENDING_EVENT_SQL = (
+    "INSERT INTO pending_events (event_type, source_server, target_server, username, user_id, item_id, item_name, "
+    "item_path, provider_imdb, provider_tmdb, provider_tvdb, event_data, created_at, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Rows per multi-row INSERT in cache_items_batch (3 bound values each, plus server_name;
+# stays under the 999-variable limit of SQLite builds before 3.32)
+ITEM_CACHE_INSERT_CHUNK = 300
+_INSERT_ITEM_CACHE_CHUNK_SQL = f"""
+    WITH items(item_path, item_id, item_name) AS (VALUES {", ".join(["(?, ?, ?)"] * ITEM_CACHE_INSERT_CHUNK)})
+    INSERT INTO item_path_cache (server_name, item_path, item_id, item_name, updated_at)
+    SELECT ?, item_path, item_id, item_name, CURRENT_TIMESTAMP FROM items WHERE true
+    ON CONFLICT(server_name, item_path)
+    DO UPDATE SET item_id = excluded.item_id,
+                  item_name = excluded.item_name,
+                  updated_at = CURRENT_TIMESTAMP
+"""
+
+INSERT_SYNC_LOG_SQL = (
+    "INSERT INTO sync_log (event_type, source_server, target_server, username, item_id, item_name, synced_value, "
+    "success, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Columns selected for PendingEvent rows, in the order _row_to_pending_event unpacks them
+PENDING_EVENT_COLUMNS = (
+    "id, event_type, source_server, target_server, username, user_id, item_id, item_name, item_path, "
+    "provider_imdb, provider_tmdb, provider_tvdb, event_data, status, retry_count, max_retries, last_error, "
+    "item_not_found_count, item_not_found_max, created_at, updated_at"
+)
+_SYNC_EVENT_TYPES = {e.value: e for e in SyncEventType}
+_EVENT_STATUSES = {s.value: s for s in PendingEventStatus}
+
+# SQL expression for the current time as unix epoch milliseconds
+SQL_NOW_MS = "CAST(ROUND((julianday('now') - 2440587.5) * 86400000) AS INTEGER)"
+
+# Schema version stored in PRAGMA user_version
+# 1: pending_events timestamps stored as INTEGER unix epoch milliseconds (were TEXT)
+# 2: counters table seeded from existing rows
+# 3: item_path_cache counted per server
+SCHEMA_VERSION = 3
+
+# Row counts kept in the counters table by triggers, so count queries are O(1).
+# pending_events is counted per status under "pending_events.<status>",
+# item_path_cache per server under "item_path_cache.<server_name>".
+COUNTER_USER_MAPPINGS = "user_mappings"
+COUNTER_SYNC_LOG = "sync_log"
+COUNTER_EVENTS_PREFIX = "pending_events."
+COUNTER_ITEM_CACHE_PREFIX = "item_path_cache."
+
+_COUNTER_TRIGGERS = {
+    "trg_pending_events_count_insert": f"""
+        AFTER INSERT ON pending_events BEGIN
+            INSERT INTO counters (key, value) VALUES ('{COUNTER_EVENTS_PREFIX}' || NEW.status, 1)
+            ON CONFLICT(key) DO UPDATE SET value = value + 1;
+        END""",
+    "trg_pending_events_count_delete": f"""
+        AFTER DELETE ON pending_events BEGIN
+            UPDATE counters SET value = value - 1 WHERE key = '{COUNTER_EVENTS_PREFIX}' || OLD.status;
+        END""",
+    "trg_pending_events_count_status": f"""
+        AFTER UPDATE OF status ON pending_events WHEN OLD.status IS NOT NEW.status BEGIN
+            UPDATE counters SET value = value - 1 WHERE key = '{COUNTER_EVENTS_PREFIX}' || OLD.status;
+            INSERT INTO counters (key, value) VALUES ('{COUNTER_EVENTS_PREFIX}' || NEW.status, 1)
+            ON CONFLICT(key) DO UPDATE SET value = value + 1;
+        END""",
+    "trg_user_mappings_count_insert": f"""
+        AFTER INSERT ON user_mappings BEGIN
+            UPDATE counters SET value = value + 1 WHERE key = '{COUNTER_USER_MAPPINGS}';
+        END""",
+    "trg_user_mappings_count_delete": f"""
+        AFTER DELETE ON user_mappings BEGIN
+            UPDATE counters SET value = value - 1 WHERE key = '{COUNTER_USER_MAPPINGS}';
+        END""",
+    "trg_sync_log_count_insert": f"""
+        AFTER INSERT ON sync_log BEGIN
+            UPDATE counters SET value = value + 1 WHERE key = '{COUNTER_SYNC_LOG}';
+        END""",
+    "trg_sync_log_count_delete": f"""
+        AFTER DELETE ON sync_log BEGIN
+            UPDATE counters SET value = value - 1 WHERE key = '{COUNTER_SYNC_LOG}';
+        END""",
+    # Upserts that hit ON CONFLICT DO UPDATE fire no INSERT trigger, so re-caching a path is not counted
+    "trg_item_path_cache_count_insert": f"""
+        AFTER INSERT ON item_path_cache BEGIN
+            INSERT INTO counters (key, value) VALUES ('{COUNTER_ITEM_CACHE_PREFIX}' || NEW.server_name, 1)
+            ON CONFLICT(key) DO UPDATE SET value = value + 1;
+        END""",
+    "trg_item_path_cache_count_delete": f"""
+        AFTER DELETE ON item_path_cache BEGIN
+            UPDATE counters SET value = value - 1 WHERE key = '{COUNTER_ITEM_CACHE_PREFIX}' || OLD.server_name;
+        END""",
+}
+
+
+def _to_ms(value: datetime) -> int:
+    """Convert a datetime to unix epoch milliseconds (naive values are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return int(value.timestamp() * 1000)
+
+
+def _now_ms() -> int:
+    """Current time as unix epoch milliseconds."""
+    return _to_ms(datetime.now(UTC))
+
+
+def _from_ms(value: int) -> datetime:
+    """Convert unix epoch milliseconds to an aware UTC datetime."""
+    return datetime.fromtimestamp(value / 1000, UTC)
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards in user input (for use with ESCAPE '\\')."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """Smallest string greater than every string starting with `prefix`, or None if there is none.
+
+    Code point order matches SQLite's UTF-8 byte order, so this is the prefix with its
+    last character bumped. U+10FFFF can't be bumped and is carried into the character
+    before it; surrogates can't be encoded, so U+D7FF bumps straight to U+E000.
+    """
+    stripped = prefix.rstrip("\U0010ffff")
+    if not stripped:
+        return None
+    last = ord(stripped[-1]) + 1
+    if 0xD800 <= last <= 0xDFFF:
+        last = 0xE000
+    return stripped[:-1] + chr(last)
+
+
+# get_recent_sync_log filters, in WHERE order. Cheap equality filters come before the
+# LIKE so they reject rows before the pattern match runs.
+_SYNC_LOG_FILTER_CONDITIONS = (
+    "created_at >= datetime('now', ?)",  # CURRENT_TIMESTAMP format, as created_at is stored
+    "source_server = ?",
+    "target_server = ?",
+    "event_type = ?",
+    "item_name LIKE ? ESCAPE '\\'",
+)
+
+
+def _build_sync_log_queries(shape: tuple[bool, ...]) -> tuple[str, str]:
+    """Build the (count, page) queries for one combination of present sync_log filters."""
+    conditions = [condition for condition, present in zip(_SYNC_LOG_FILTER_CONDITIONS, shape, strict=True) if present]
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    count_sql = f"SELECT COUNT(*) FROM sync_log {where}"
+    page_sql = f"""
+        SELECT id, event_type, source_server, target_server,
+               username, item_id, item_name, synced_value, success, message, created_at
+        FROM sync_log
+        {where}
+        ORDER BY created_at DESC
+        LIMIT ? OFFSET ?
+    """
+    return count_sql, page_sql
+
+
+# Every filter combination's SQL, built once; the text per shape is fixed, so each
+# shape maps to one cached prepared statement
+_SYNC_LOG_QUERIES = {
+    shape: _build_sync_log_queries(shape)
+    for shape in itertools.product((False, True), repeat=len(_SYNC_LOG_FILTER_CONDITIONS))
+}
+
+
+# INSERT ... RETURNING needs SQLite 3.35+
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Defaults applied in WAL mode when synchronous/mmap_size are not configured
+WAL_SYNCHRONOUS = "NORMAL"
+WAL_MMAP_SIZE = 256 * 1024 * 1024
+
 
 class Database:
     """Async SQLite database for user mappings."""
@@ -21,6 +226,23 @@ class Database:
         self._config_db_path = db_path
         self._config_journal_mode = journal_mode
         self._db: aiosqlite.Connection | None = None
+        # Write transactions: one task at a time owns the connection's transaction (see batch())
+        self._write_lock = asyncio.Lock()
+        self._batch_owner: asyncio.Task[Any] | None = None
+        self._batch_depth = 0  # Nested batch() blocks of the owning task
+        self._batch_sync_log: list[tuple[Any, ...]] = []  # sync_log rows queued once the open batch commits
+        self._mapping_cache: TTLCache[tuple[str, str], UserMapping] = TTLCache(maxsize=USER_MAPPING_CACHE_MAXSIZE)
+        self._mapping_generation = 0  # Bumped by every user_mappings write (see get_user_mapping)
+        self._item_path_cache: TTLCache[tuple[str, str], str] = TTLCache(maxsize=ITEM_PATH_CACHE_MAXSIZE)
+        self._item_cache_generation = 0  # Bumped by every item_path_cache write (see get_cached_item_id)
+        # Read-only connections for status/statistics queries and item path lookups (WAL only)
+        self._readers: list[aiosqlite.Connection] = []
+        self._next_reader = 0
+        # Audit rows waiting to be written to sync_log by the background writer
+        self._sync_log_queue: asyncio.Queue[tuple[Any, ...]] = asyncio.Queue()
+        self._sync_log_task: asyncio.Task[None] | None = None
+        # Last get_database_size result: (monotonic timestamp, bytes)
+        self._size_cache: tuple[float, int] | None = None
 
     @property
     def db_path(self) -> str:
@@ -39,6 +261,37 @@ class Database:
         except RuntimeError:
             return "WAL"  # Default if config not loaded (tests)
 
+    @property
+    def settings(self) -> DatabaseConfig:
+        """Get database settings from config (defaults if config not loaded)."""
+        try:
+            return get_config().database
+        except RuntimeError:
+            return DatabaseConfig()  # Defaults if config not loaded (tests)
+
+    def _tuning_pragmas(self) -> list[str]:
+        """PRAGMA statements applied to each new connection after journal_mode."""
+        settings = self.settings
+        wal = self.journal_mode == "WAL"
+        pragmas = [
+            f"PRAGMA cache_size=-{int(settings.cache_size_kib)}",
+            "PRAGMA temp_store=MEMORY",
+            f"PRAGMA busy_timeout={int(settings.busy_timeout_ms)}",
+        ]
+
+        synchronous = settings.synchronous or (WAL_SYNCHRONOUS if wal else None)
+        if synchronous:
+            if synchronous.upper() in ("OFF", "NORMAL", "FULL", "EXTRA"):
+                pragmas.append(f"PRAGMA synchronous={synchronous.upper()}")
+            else:
+                logger.warning("Ignoring invalid database.synchronous: %s", synchronous)
+
+        mmap_size = settings.mmap_size if settings.mmap_size is not None else (WAL_MMAP_SIZE if wal else None)
+        if mmap_size is not None:
+            pragmas.append(f"PRAGMA mmap_size={int(mmap_size)}")
+
+        return pragmas
+
     async def connect(self) -> None:
         """Connect to the database and create tables."""
         # Ensure parent directory exists
@@ -46,23 +299,128 @@ class Database:
         db_path.parent.mkdir(parents=True, exist_ok=True)
 
         logger.info("Connecting to database: %s (journal_mode=%s)", db_path, self.journal_mode)
-        self._db = await aiosqlite.connect(self.db_path)
+        self._db = await aiosqlite.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
         self._db.row_factory = aiosqlite.Row
 
         # Set journal mode (WAL is default, use DELETE for NFS compatibility)
         if self.journal_mode in ("WAL", "DELETE", "TRUNCATE", "MEMORY", "OFF"):
             await self._db.execute(f"PRAGMA journal_mode={self.journal_mode}")
 
+        for pragma in self._tuning_pragmas():
+            await self._db.execute(pragma)
+
+        self._write_lock = asyncio.Lock()
         await self._create_tables()
+        await self._open_readers()
+        self._sync_log_queue = asyncio.Queue()
+        self._sync_log_task = asyncio.create_task(self._sync_log_writer())
         logger.info("Database connected successfully")
 
+    async def _open_readers(self) -> None:
+        """Open read-only connections so status queries and item path lookups don't queue behind writes.
+
+        Each aiosqlite connection runs on its own thread, and in WAL mode readers
+        don't block (or get blocked by) the writer. Other journal modes and
+        in-memory databases keep all queries on the main connection.
+        """
+        count = self.settings.reader_connections
+        if count <= 0 or self.journal_mode != "WAL" or self.db_path == ":memory:":
+            return
+
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        for _ in range(count):
+            reader = await aiosqlite.connect(uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE)
+            reader.row_factory = aiosqlite.Row
+            for pragma in self._tuning_pragmas():
+                if not pragma.startswith("PRAGMA synchronous"):
+                    await reader.execute(pragma)
+            self._readers.append(reader)
+        logger.debug("Opened %d read-only database connections", count)
+
+    def _reader(self) -> aiosqlite.Connection:
+        """Get a connection for read-only queries (round-robin over readers).
+
+        Readers only see committed data. Write methods return committed (see batch()),
+        so only the task holding an open batch() has uncommitted writes; its queries
+        use the main connection, so it reads its own writes.
+        """
+        assert self._db is not None
+        if not self._readers or self._owns_batch():
+            return self._db
+        self._next_reader = (self._next_reader + 1) % len(self._readers)
+        return self._readers[self._next_reader]
+
     async def close(self) -> None:
-        """Close the database connection."""
+        """Close the database connection, first writing any queued sync_log rows."""
+        if self._sync_log_task:
+            try:
+                async with asyncio.timeout(SYNC_LOG_DRAIN_TIMEOUT_SECONDS):
+                    await self._sync_log_queue.join()
+            except TimeoutError:
+                logger.warning("Timed out writing sync log, %d entries dropped", self._sync_log_queue.qsize())
+            self._sync_log_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._sync_log_task
+            self._sync_log_task = None
+
+        for reader in self._readers:
+            await reader.close()
+        self._readers.clear()
         if self._db:
             logger.info("Closing database connection")
             await self._db.close()
             self._db = None
 
+    @contextlib.asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """Run the writes made inside the block as one transaction, committed on exit.
+
+        The transaction belongs to the current task: other tasks' writes wait until
+        the block exits and then commit on their own, so a write method always returns
+        committed unless its caller holds a block. Nested blocks of the same task join
+        the outermost one. If the block raises, its writes are rolled back.
+        Every write method runs in a block; keep network I/O out of them so other
+        writers are not held back.
+        """
+        assert self._db is not None
+
+        if self._owns_batch():
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+            return
+
+        async with self._write_lock:
+            self._batch_owner = asyncio.current_task()
+            self._batch_depth = 1
+            try:
+                yield
+            except BaseException:
+                await self._rollback()
+                raise
+            else:
+                await self._db.commit()
+                for row in self._batch_sync_log:
+                    self._sync_log_queue.put_nowait(row)
+            finally:
+                self._batch_owner = None
+                self._batch_depth = 0
+                self._batch_sync_log.clear()
+
+    def _owns_batch(self) -> bool:
+        """Whether the current task holds the open batch() transaction."""
+        return self._batch_owner is not None and self._batch_owner is asyncio.current_task()
+
+    async def _rollback(self) -> None:
+        """Roll back the open transaction and forget cache entries it may have set."""
+        assert self._db is not None
+        await self._db.rollback()
+        self._mapping_cache.clear()
+        self._item_path_cache.clear()
+        logger.warning("Database transaction rolled back")
+
     async def _create_tables(self) -> None:
         """Create database tables if they don't exist."""
         assert self._db is not None
@@ -81,12 +439,9 @@ class Database:
         """
         )
 
-        await self._db.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_user_mappings_username
-            ON user_mappings(username)
-        """
-        )
+        # Lookups by username use the UNIQUE(username, server_name) index prefix;
+        # drop the separate username index older versions created
+        await self._db.execute("DROP INDEX IF EXISTS idx_user_mappings_username")
 
         await self._db.execute(
             """
@@ -107,28 +462,35 @@ class Database:
         )
 
         # Migration: add item_name and synced_value columns if they don't exist
-        with contextlib.suppress(Exception):
-            await self._db.execute("ALTER TABLE sync_log ADD COLUMN item_name TEXT")
-        with contextlib.suppress(Exception):
-            await self._db.execute("ALTER TABLE sync_log ADD COLUMN synced_value TEXT")
+        await self._add_missing_columns("sync_log", {"item_name": "TEXT", "synced_value": "TEXT"})
 
         # Indexes for sync_log - critical for large log tables
+        # Newest-first log pages and time-window counts; the filter columns let filters that
+        # are not a prefix of idx_sync_log_filters_created be checked without reading the row.
+        # Replaces idx_sync_log_created_at (created_at only)
+        await self._db.execute("DROP INDEX IF EXISTS idx_sync_log_created_at")
         await self._db.execute(
             """
-            CREATE INDEX IF NOT EXISTS idx_sync_log_created_at
-            ON sync_log(created_at DESC)
+            CREATE INDEX IF NOT EXISTS idx_sync_log_created_filters
+            ON sync_log(created_at DESC, source_server, target_server, event_type)
         """
         )
+        # Filtered log views: equality filters, then created_at for the range filter and ORDER BY,
+        # so they need no sort; replaces idx_sync_log_filters (no created_at)
+        await self._db.execute("DROP INDEX IF EXISTS idx_sync_log_filters")
         await self._db.execute(
             """
-            CREATE INDEX IF NOT EXISTS idx_sync_log_filters
-            ON sync_log(source_server, target_server, event_type)
+            CREATE INDEX IF NOT EXISTS idx_sync_log_filters_created
+            ON sync_log(source_server, target_server, event_type, created_at)
         """
         )
+        # Item name prefix search: LIKE is case-insensitive, so only a NOCASE index can serve
+        # 'term%' as a range scan; replaces idx_sync_log_item_name (BINARY, never usable by LIKE)
+        await self._db.execute("DROP INDEX IF EXISTS idx_sync_log_item_name")
         await self._db.execute(
             """
-            CREATE INDEX IF NOT EXISTS idx_sync_log_item_name
-            ON sync_log(item_name)
+            CREATE INDEX IF NOT EXISTS idx_sync_log_item_name_nocase
+            ON sync_log(item_name COLLATE NOCASE)
         """
         )
         # Index for statistics aggregation
@@ -141,7 +503,7 @@ class Database:
 
         # Pending events table (WAL for sync operations)
         await self._db.execute(
-            """
+            f"""
             CREATE TABLE IF NOT EXISTS pending_events (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 event_type TEXT NOT NULL,
@@ -155,24 +517,37 @@ class Database:
                 provider_imdb TEXT,
                 provider_tmdb TEXT,
                 provider_tvdb TEXT,
-                event_data TEXT NOT NULL DEFAULT '{}',
+                event_data TEXT NOT NULL DEFAULT '{{}}',
                 status TEXT NOT NULL DEFAULT 'pending',
                 retry_count INTEGER NOT NULL DEFAULT 0,
                 max_retries INTEGER NOT NULL DEFAULT 5,
                 last_error TEXT,
                 item_not_found_count INTEGER NOT NULL DEFAULT 0,
                 item_not_found_max INTEGER NOT NULL DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                next_retry_at TIMESTAMP
+                created_at INTEGER NOT NULL DEFAULT ({SQL_NOW_MS}),  -- unix epoch ms
+                updated_at INTEGER NOT NULL DEFAULT ({SQL_NOW_MS}),  -- unix epoch ms
+                next_retry_at INTEGER  -- unix epoch ms
             )
         """
         )
 
+        # Migration: add item-not-found tracking columns if they don't exist
+        await self._add_missing_columns(
+            "pending_events",
+            {
+                "item_not_found_count": "INTEGER NOT NULL DEFAULT 0",
+                "item_not_found_max": "INTEGER NOT NULL DEFAULT 0",
+            },
+        )
+
+        # Ready-event queries filter by status, skip rows not yet due and take the oldest first:
+        # scanning this index in created_at order needs no sort, and the claim subquery
+        # (id, next_retry_at) is answered from the index alone
+        await self._db.execute("DROP INDEX IF EXISTS idx_pending_events_status")
         await self._db.execute(
             """
-            CREATE INDEX IF NOT EXISTS idx_pending_events_status
-            ON pending_events(status, next_retry_at)
+            CREATE INDEX IF NOT EXISTS idx_pending_events_ready
+            ON pending_events(status, created_at, next_retry_at)
         """
         )
 
@@ -208,27 +583,114 @@ class Database:
         """
         )
 
+        # UNIQUE(server_name, item_path) already indexes path lookups;
+        # drop the duplicate index older versions created
+        await self._db.execute("DROP INDEX IF EXISTS idx_item_path_cache_path")
+
+        # Additional index for item_id lookups in cache
         await self._db.execute(
             """
-            CREATE INDEX IF NOT EXISTS idx_item_path_cache_path
-            ON item_path_cache(server_name, item_path)
+            CREATE INDEX IF NOT EXISTS idx_item_path_cache_item_id
+            ON item_path_cache(server_name, item_id)
         """
         )
 
-        # Additional index for item_id lookups in cache
+        # Row counters, maintained by triggers in the same transaction as the write
         await self._db.execute(
             """
-            CREATE INDEX IF NOT EXISTS idx_item_path_cache_item_id
-            ON item_path_cache(server_name, item_id)
+            CREATE TABLE IF NOT EXISTS counters (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID
         """
         )
+        for name, body in _COUNTER_TRIGGERS.items():
+            await self._db.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+        await self._migrate_schema()
 
         await self._db.commit()
 
+    async def _add_missing_columns(self, table: str, columns: dict[str, str]) -> None:
+        """Add columns that older databases lack, checking the schema once instead of probing with ALTER."""
+        assert self._db is not None
+
+        async with self._db.execute(f"PRAGMA table_info({table})") as cursor:
+            existing = {row[1] for row in await cursor.fetchall()}
+        for name, definition in columns.items():
+            if name not in existing:
+                await self._db.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+                logger.info("Added column %s.%s", table, name)
+
+    async def _migrate_schema(self) -> None:
+        """Apply one-shot data migrations tracked by PRAGMA user_version."""
+        assert self._db is not None
+
+        async with self._db.execute("PRAGMA user_version") as cursor:
+            row = await cursor.fetchone()
+        version = row[0] if row else 0
+        if version >= SCHEMA_VERSION:
+            return
+
+        if version < 1:
+            # TEXT timestamps (CURRENT_TIMESTAMP or ISO 8601) -> INTEGER unix epoch ms
+            for column in ("created_at", "updated_at", "next_retry_at"):
+                await self._db.execute(
+                    f"""
+                    UPDATE pending_events
+                    SET {column} = CAST(ROUND((julianday({column}) - 2440587.5) * 86400000) AS INTEGER)
+                    WHERE typeof({column}) = 'text'
+                    """
+                )
+            logger.info("Migrated pending_events timestamps to unix epoch milliseconds")
+
+        if version < 3:
+            await self._rebuild_counters()
+
+        await self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    async def _rebuild_counters(self) -> None:
+        """Recompute the counters table from the counted tables."""
+        assert self._db is not None
+
+        await self._db.execute("DELETE FROM counters")
+        await self._db.execute(
+            f"""
+            INSERT INTO counters (key, value)
+            SELECT '{COUNTER_USER_MAPPINGS}', COUNT(*) FROM user_mappings
+            UNION ALL
+            SELECT '{COUNTER_SYNC_LOG}', COUNT(*) FROM sync_log
+            UNION ALL
+            SELECT '{COUNTER_EVENTS_PREFIX}' || status, COUNT(*) FROM pending_events GROUP BY status
+            UNION ALL
+            SELECT '{COUNTER_ITEM_CACHE_PREFIX}' || server_name, COUNT(*) FROM item_path_cache GROUP BY server_name
+            """
+        )
+        logger.debug("Rebuilt row counters")
+
+    async def _get_counter(self, *keys: str) -> int:
+        """Get the sum of the given row counters."""
+        async with self._reader().execute(
+            f"SELECT COALESCE(SUM(value), 0) FROM counters WHERE key IN ({', '.join('?' * len(keys))})", keys
+        ) as cursor:
+            cursor.row_factory = None
+            row = await cursor.fetchone()
+            return row[0] if row else 0
+
     async def get_user_mapping(self, username: str, server_name: str) -> UserMapping | None:
-        """Get user mapping for a specific server."""
+        """Get user mapping for a specific server (cached).
+
+        A row is cached only if no mapping was written while it was read, so a
+        lookup racing an upsert or delete can't put the old row back in memory.
+        """
         assert self._db is not None
 
+        cached = self._mapping_cache.get((username, server_name))
+        if cached is not None:
+            return cached
+
+        generation = self._mapping_generation
+
         async with self._db.execute(
             """
             SELECT id, username, server_name, jellyfin_user_id, created_at, updated_at
@@ -240,7 +702,7 @@ class Database:
             row = await cursor.fetchone()
             if row:
                 logger.debug("[%s] Found user mapping: %s -> %s", server_name, username, row["jellyfin_user_id"])
-                return UserMapping(
+                mapping = UserMapping(
                     id=row["id"],
                     username=row["username"],
                     server_name=row["server_name"],
@@ -248,6 +710,9 @@ class Database:
                     created_at=row["created_at"],
                     updated_at=row["updated_at"],
                 )
+                if generation == self._mapping_generation:
+                    self._mapping_cache.set((username, server_name), mapping)
+                return mapping
             logger.debug("[%s] User mapping not found: %s", server_name, username)
             return None
 
@@ -256,8 +721,7 @@ class Database:
         assert self._db is not None
 
         logger.debug("Looking up all mappings for user: %s", username)
-        mappings = []
-        async with self._db.execute(
+        async with self._reader().execute(
             """
             SELECT id, username, server_name, jellyfin_user_id, created_at, updated_at
             FROM user_mappings
@@ -265,17 +729,18 @@ class Database:
             """,
             (username,),
         ) as cursor:
-            async for row in cursor:
-                mappings.append(
-                    UserMapping(
-                        id=row["id"],
-                        username=row["username"],
-                        server_name=row["server_name"],
-                        jellyfin_user_id=row["jellyfin_user_id"],
-                        created_at=row["created_at"],
-                        updated_at=row["updated_at"],
-                    )
-                )
+            rows = await cursor.fetchall()
+        mappings = [
+            UserMapping(
+                id=row["id"],
+                username=row["username"],
+                server_name=row["server_name"],
+                jellyfin_user_id=row["jellyfin_user_id"],
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+            )
+            for row in rows
+        ]
         logger.debug("Found %d mappings for user %s", len(mappings), username)
         return mappings
 
@@ -284,38 +749,123 @@ class Database:
         assert self._db is not None
 
         logger.debug("[%s] Upserting user mapping: %s -> %s", server_name, username, jellyfin_user_id)
-        await self._db.execute(
-            """
+        query = """
             INSERT INTO user_mappings (username, server_name, jellyfin_user_id, updated_at)
             VALUES (?, ?, ?, CURRENT_TIMESTAMP)
             ON CONFLICT(username, server_name)
             DO UPDATE SET jellyfin_user_id = excluded.jellyfin_user_id,
                           updated_at = CURRENT_TIMESTAMP
-            """,
-            (username, server_name, jellyfin_user_id),
-        )
-        await self._db.commit()
+            """
+        params = (username, server_name, jellyfin_user_id)
+
+        mapping: UserMapping | None
+        if not SQLITE_HAS_RETURNING:
+            async with self.batch():
+                self._mapping_generation += 1
+                await self._db.execute(query, params)
+                mapping = await self.get_user_mapping(username, server_name)
+        else:
+            # Get the stored row back from the same statement (no second SELECT)
+            async with self.batch():
+                self._mapping_generation += 1
+                async with self._db.execute(
+                    query + " RETURNING id, username, server_name, jellyfin_user_id, created_at, updated_at", params
+                ) as cursor:
+                    row = await cursor.fetchone()
+            assert row is not None
+            mapping = UserMapping(
+                id=row["id"],
+                username=row["username"],
+                server_name=row["server_name"],
+                jellyfin_user_id=row["jellyfin_user_id"],
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+            )
 
-        mapping = await self.get_user_mapping(username, server_name)
         assert mapping is not None
+        self._mapping_cache.set((username, server_name), mapping)
         logger.info("[%s] User mapping saved: %s -> %s", server_name, username, jellyfin_user_id)
         return mapping
 
+    async def upsert_user_mappings(self, mappings: list[tuple[str, str, str]]) -> None:
+        """Insert or update several user mappings in one transaction.
+
+        Mappings already cached with the same user ID are not written, so updated_at
+        records when a mapping's user ID last changed, not when it was last seen.
+
+        Args:
+            mappings: (username, server_name, jellyfin_user_id) tuples
+        """
+        assert self._db is not None
+
+        # Mappings already cached with the same user ID need no write
+        changed = []
+        for username, server_name, jellyfin_user_id in mappings:
+            cached = self._mapping_cache.get((username, server_name))
+            if cached is None or cached.jellyfin_user_id != jellyfin_user_id:
+                changed.append((username, server_name, jellyfin_user_id))
+        if not changed:
+            return
+
+        async with self.batch():
+            self._mapping_generation += 1
+            await self._db.executemany(
+                """
+                INSERT INTO user_mappings (username, server_name, jellyfin_user_id, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(username, server_name)
+                DO UPDATE SET jellyfin_user_id = excluded.jellyfin_user_id,
+                              updated_at = CURRENT_TIMESTAMP
+                """,
+                changed,
+            )
+        for username, server_name, _ in changed:
+            self._mapping_cache.pop((username, server_name))
+        logger.info("Saved %d user mappings", len(changed))
+
     async def delete_user_mapping(self, username: str, server_name: str) -> bool:
         """Delete a user mapping. Returns True if deleted."""
         assert self._db is not None
 
         logger.debug("[%s] Deleting user mapping: %s", server_name, username)
-        cursor = await self._db.execute(
-            "DELETE FROM user_mappings WHERE username = ? AND server_name = ?",
-            (username, server_name),
-        )
-        await self._db.commit()
+        async with self.batch():
+            self._mapping_generation += 1
+            cursor = await self._db.execute(
+                "DELETE FROM user_mappings WHERE username = ? AND server_name = ?",
+                (username, server_name),
+            )
+        self._mapping_cache.pop((username, server_name))
         deleted = cursor.rowcount > 0
         if deleted:
             logger.info("[%s] Deleted user mapping: %s", server_name, username)
         return deleted
 
+    async def delete_user_mappings(self, mappings: list[tuple[str, str]]) -> int:
+        """Delete several user mappings in one transaction.
+
+        Args:
+            mappings: (username, server_name) tuples
+
+        Returns:
+            Number of mappings deleted
+        """
+        assert self._db is not None
+
+        if not mappings:
+            return 0
+
+        async with self.batch():
+            self._mapping_generation += 1
+            cursor = await self._db.executemany(
+                "DELETE FROM user_mappings WHERE username = ? AND server_name = ?",
+                mappings,
+            )
+        for key in mappings:
+            self._mapping_cache.pop(key)
+        deleted = max(cursor.rowcount, 0)
+        logger.info("Deleted %d user mappings", deleted)
+        return deleted
+
     async def log_sync(
         self,
         event_type: str,
@@ -328,8 +878,13 @@ class Database:
         item_name: str | None = None,
         synced_value: str | None = None,
     ) -> None:
-        """Log a sync operation."""
-        assert self._db is not None
+        """Log a sync operation.
+
+        The sync_log row is written by a background task that batches rows into one
+        commit; sync_log queries wait for queued rows first (see flush_sync_log).
+        Inside batch(), the row is queued when the transaction commits and dropped
+        if it rolls back.
+        """
 
         if success:
             logger.info(
@@ -351,15 +906,62 @@ class Database:
                 message,
             )
 
-        await self._db.execute(
-            """
-            INSERT INTO sync_log
-            (event_type, source_server, target_server, username, item_id, item_name, synced_value, success, message)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (event_type, source_server, target_server, username, item_id, item_name, synced_value, success, message),
-        )
-        await self._db.commit()
+        row = (event_type, source_server, target_server, username, item_id, item_name, synced_value, success, message)
+        if self._owns_batch():
+            # Logged only if the caller's transaction commits
+            self._batch_sync_log.append(row)
+        else:
+            self._sync_log_queue.put_nowait(row)
+
+    async def _sync_log_writer(self) -> None:
+        """Write queued sync_log rows, batching whatever has piled up into one commit."""
+        while True:
+            rows = [await self._sync_log_queue.get()]
+            while len(rows) < SYNC_LOG_BATCH_SIZE:
+                try:
+                    rows.append(self._sync_log_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._write_sync_log(rows)
+            finally:
+                for _ in rows:
+                    self._sync_log_queue.task_done()
+
+    async def _write_sync_log(self, rows: list[tuple[Any, ...]]) -> None:
+        """Insert sync_log rows in one transaction, falling back to one transaction per row.
+
+        A row that can't be written on its own is logged and skipped instead of
+        taking the rest of the batch with it.
+        """
+        assert self._db is not None
+
+        try:
+            async with self.batch():
+                await self._db.executemany(INSERT_SYNC_LOG_SQL, rows)
+            return
+        except Exception as e:
+            if len(rows) == 1:
+                logger.exception("Failed to write sync log entry %s: %s", rows[0], e)
+                return
+            logger.warning("Failed to write %d sync log entries at once, retrying one by one: %s", len(rows), e)
+
+        for row in rows:
+            try:
+                async with self.batch():
+                    await self._db.execute(INSERT_SYNC_LOG_SQL, row)
+            except Exception as e:
+                logger.exception("Failed to write sync log entry %s: %s", row, e)
+
+    async def flush_sync_log(self) -> None:
+        """Wait until sync_log rows queued so far are written and committed.
+
+        Can't be called inside batch(): the writer needs the transaction to commit.
+        """
+        if self._owns_batch():
+            raise RuntimeError("flush_sync_log() called inside batch()")
+        if self._sync_log_task:
+            await self._sync_log_queue.join()
 
     # ========== Pending Events (WAL) ==========
 
@@ -386,6 +988,7 @@ class Database:
             """,
             (event_type.value, target_server, username, item_id),
         ) as cursor:
+            cursor.row_factory = None
             row = await cursor.fetchone()
             exists = row is not None
             if exists:
@@ -419,44 +1022,92 @@ class Database:
             username,
         )
 
-        cursor = await self._db.execute(
-            """
-            INSERT INTO pending_events
-            (event_type, source_server, target_server, username, user_id,
-             item_id, item_name, item_path, provider_imdb, provider_tmdb, provider_tvdb, event_data)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                event_type.value,
-                source_server,
-                target_server,
-                username,
-                user_id,
-                item_id,
-                item_name,
-                item_path,
-                provider_imdb,
-                provider_tmdb,
-                provider_tvdb,
-                json.dumps(event_data),
-            ),
-        )
-        await self._db.commit()
+        now = _now_ms()
+        async with self.batch():
+            cursor = await self._db.execute(
+                INSERT_PENDING_EVENT_SQL,
+                (
+                    event_type.value,
+                    source_server,
+                    target_server,
+                    username,
+                    user_id,
+                    item_id,
+                    item_name,
+                    item_path,
+                    provider_imdb,
+                    provider_tmdb,
+                    provider_tvdb,
+                    to_json(event_data).decode(),
+                    now,
+                    now,
+                ),
+            )
         event_id = cursor.lastrowid or 0
         logger.debug("[%s->%s] Event queued with id=%d", source_server, target_server, event_id)
         return event_id
 
+    async def add_pending_events(self, events: list[dict[str, Any]]) -> None:
+        """Add several pending events in one transaction.
+
+        Args:
+            events: Dicts with the keyword arguments of add_pending_event
+        """
+        assert self._db is not None
+
+        if not events:
+            return
+
+        for event in events:
+            logger.info(
+                "[%s->%s] Queued event: %s %s for %s",
+                event["source_server"],
+                event["target_server"],
+                event["event_type"].value,
+                event["item_name"],
+                event["username"],
+            )
+
+        now = _now_ms()
+        async with self.batch():
+            await self._db.executemany(
+                INSERT_PENDING_EVENT_SQL,
+                [
+                    (
+                        event["event_type"].value,
+                        event["source_server"],
+                        event["target_server"],
+                        event["username"],
+                        event["user_id"],
+                        event["item_id"],
+                        event["item_name"],
+                        event.get("item_path"),
+                        event.get("provider_imdb"),
+                        event.get("provider_tmdb"),
+                        event.get("provider_tvdb"),
+                        to_json(event["event_data"]).decode(),
+                        now,
+                        now,
+                    )
+                    for event in events
+                ],
+            )
+
     async def get_pending_events(self, limit: int = 100) -> list[PendingEvent]:
-        """Get pending events ready for processing."""
+        """Get pending events ready for processing.
+
+        Read on the main connection, like the worker's status updates it must not
+        race: a read-only connection could return events already claimed or
+        rescheduled by a transaction that has not committed yet.
+        """
         assert self._db is not None
 
         logger.debug("Fetching pending events (limit=%d)", limit)
-        now = datetime.now(UTC).isoformat()
-        events = []
+        now = _now_ms()
 
         async with self._db.execute(
-            """
-            SELECT * FROM pending_events
+            f"""
+            SELECT {PENDING_EVENT_COLUMNS} FROM pending_events
             WHERE status = 'pending'
               AND (next_retry_at IS NULL OR next_retry_at <= ?)
             ORDER BY created_at ASC
@@ -464,36 +1115,93 @@ class Database:
             """,
             (now, limit),
         ) as cursor:
-            async for row in cursor:
-                events.append(self._row_to_pending_event(row))
+            cursor.row_factory = None  # plain tuples, unpacked positionally
+            rows = await cursor.fetchall()
+        events = [self._row_to_pending_event(row) for row in rows]
 
         if events:
             logger.debug("Fetched %d pending events for processing", len(events))
         return events
 
+    async def claim_pending_events(self, limit: int = 100) -> list[PendingEvent]:
+        """Get pending events ready for processing and mark them as processing.
+
+        Selecting and marking is a single UPDATE ... RETURNING statement, so an
+        event can't be claimed twice and the batch costs one commit.
+        """
+        assert self._db is not None
+
+        if not SQLITE_HAS_RETURNING:
+            async with self.batch():
+                events = await self.get_pending_events(limit=limit)
+                for event in events:
+                    assert event.id is not None
+                    await self.mark_event_processing(event.id)
+            return events
+
+        logger.debug("Claiming pending events (limit=%d)", limit)
+        now = _now_ms()
+
+        async with self.batch():
+            async with self._db.execute(
+                f"""
+                UPDATE pending_events
+                SET status = 'processing', updated_at = ?
+                WHERE id IN (
+                    SELECT id FROM pending_events
+                    WHERE status = 'pending'
+                      AND (next_retry_at IS NULL OR next_retry_at <= ?)
+                    ORDER BY created_at ASC
+                    LIMIT ?
+                )
+                RETURNING {PENDING_EVENT_COLUMNS}
+                """,
+                (now, now, limit),
+            ) as cursor:
+                cursor.row_factory = None  # plain tuples, unpacked positionally
+                rows = await cursor.fetchall()
+            events = [self._row_to_pending_event(row) for row in rows]
+
+        # RETURNING order is unspecified; process oldest first as before
+        events.sort(key=lambda e: (e.created_at, e.id or 0))
+        if events:
+            logger.debug("Claimed %d pending events for processing", len(events))
+        return events
+
     async def mark_event_processing(self, event_id: int) -> None:
         """Mark an event as being processed."""
         assert self._db is not None
 
         logger.debug("Event %d: status -> processing", event_id)
-        await self._db.execute(
-            """
-            UPDATE pending_events
-            SET status = 'processing', updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-            """,
-            (event_id,),
-        )
-        await self._db.commit()
+        async with self.batch():
+            await self._db.execute(
+                """
+                UPDATE pending_events
+                SET status = 'processing', updated_at = ?
+                WHERE id = ?
+                """,
+                (_now_ms(), event_id),
+            )
 
     async def mark_event_completed(self, event_id: int, synced_value: str | None = None) -> None:
         """Remove a successfully processed event."""
         assert self._db is not None
 
-        # Get event data for logging before deletion
-        query = "SELECT * FROM pending_events WHERE id = ?"
-        async with self._db.execute(query, (event_id,)) as cursor:
-            row = await cursor.fetchone()
+        # Committed on exit (the sync_log entry is queued for the background writer)
+        async with self.batch():
+            if SQLITE_HAS_RETURNING:
+                # Delete and get event data for logging in one statement
+                query = """
+                    DELETE FROM pending_events WHERE id = ?
+                    RETURNING event_type, source_server, target_server, username, item_id, item_name
+                """
+                async with self._db.execute(query, (event_id,)) as cursor:
+                    row = await cursor.fetchone()
+            else:
+                async with self._db.execute("SELECT * FROM pending_events WHERE id = ?", (event_id,)) as cursor:
+                    row = await cursor.fetchone()
+                await self._db.execute("DELETE FROM pending_events WHERE id = ?", (event_id,))
+
             if row:
                 logger.debug(
                     "Event %d: completed (%s %s)",
@@ -514,30 +1222,48 @@ class Database:
                     synced_value=synced_value,
                 )
 
-        # Delete from pending
-        await self._db.execute("DELETE FROM pending_events WHERE id = ?", (event_id,))
-        await self._db.commit()
-
     async def mark_event_failed(self, event_id: int, error: str) -> None:
-        """Mark an event as failed, schedule retry or give up."""
+        """Mark an event as failed, schedule retry or give up.
+
+        The retry decision and backoff are computed by a single UPDATE; the row is
+        only touched again when the event has run out of retries.
+        """
         assert self._db is not None
 
-        # Get current retry count
-        query = """
-            SELECT retry_count, max_retries, event_type, source_server,
-                   target_server, username, item_id, item_name
-            FROM pending_events WHERE id = ?
+        now = _now_ms()
+        # SET expressions see the old retry_count; backoff is 10s * 2^retries, max 5 minutes
+        update = """
+            UPDATE pending_events
+            SET retry_count = retry_count + 1,
+                status = CASE WHEN retry_count + 1 >= max_retries THEN 'failed' ELSE 'pending' END,
+                last_error = ?,
+                next_retry_at = ? + MIN(300, 10 * (1 << MIN(retry_count + 1, 5))) * 1000,
+                updated_at = ?
+            WHERE id = ?
         """
-        async with self._db.execute(query, (event_id,)) as cursor:
-            row = await cursor.fetchone()
+        params = (error, now, now, event_id)
+        returning = (
+            "retry_count, max_retries, status, event_type, source_server, target_server, username, item_id, item_name"
+        )
+
+        # Committed on exit, whichever branch runs (the sync_log entry is queued for the background writer)
+        async with self.batch():
+            if SQLITE_HAS_RETURNING:
+                async with self._db.execute(f"{update} RETURNING {returning}", params) as cursor:
+                    row = await cursor.fetchone()
+            else:
+                await self._db.execute(update, params)
+                async with self._db.execute(
+                    f"SELECT {returning} FROM pending_events WHERE id = ?", (event_id,)
+                ) as cursor:
+                    row = await cursor.fetchone()
+
             if not row:
                 logger.warning("Event %d: not found for marking as failed", event_id)
                 return
 
-            retry_count = row["retry_count"] + 1
-            max_retries = row["max_retries"]
-
-            if retry_count >= max_retries:
+            retry_count = row["retry_count"]
+            if row["status"] == PendingEventStatus.FAILED.value:
                 # Move to log as failed and delete
                 logger.error(
                     "Event %d: FAILED after %d retries (%s %s) - %s",
@@ -559,61 +1285,39 @@ class Database:
                 )
                 await self._db.execute("DELETE FROM pending_events WHERE id = ?", (event_id,))
             else:
-                # Schedule retry with exponential backoff
-                backoff_seconds = min(300, 10 * (2**retry_count))  # Max 5 minutes
-                next_retry = datetime.now(UTC) + timedelta(seconds=backoff_seconds)
-
                 logger.warning(
                     "Event %d: retry %d/%d in %ds (%s) - %s",
                     event_id,
                     retry_count,
-                    max_retries,
-                    backoff_seconds,
+                    row["max_retries"],
+                    min(300, 10 * (2 ** min(retry_count, 5))),
                     row["item_name"],
                     error,
                 )
 
-                await self._db.execute(
-                    """
-                    UPDATE pending_events
-                    SET status = 'pending',
-                        retry_count = ?,
-                        last_error = ?,
-                        next_retry_at = ?,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                    """,
-                    (retry_count, error, next_retry.isoformat(), event_id),
-                )
-
-        await self._db.commit()
-
     async def get_pending_count(self) -> int:
         """Get count of pending events."""
         assert self._db is not None
 
-        async with self._db.execute(
-            "SELECT COUNT(*) as count FROM pending_events WHERE status IN ('pending', 'processing')"
-        ) as cursor:
-            row = await cursor.fetchone()
-            return row["count"] if row else 0
+        return await self._get_counter(COUNTER_EVENTS_PREFIX + "pending", COUNTER_EVENTS_PREFIX + "processing")
 
     async def reset_stale_processing(self, stale_minutes: int = 5) -> int:
         """Reset events stuck in processing state for too long."""
         assert self._db is not None
 
         logger.debug("Checking for stale events (>%d minutes)", stale_minutes)
-        stale_time = (datetime.now(UTC) - timedelta(minutes=stale_minutes)).strftime("%Y-%m-%d %H:%M:%S")
+        now = _now_ms()
+        stale_time = now - stale_minutes * 60_000
 
-        cursor = await self._db.execute(
-            """
-            UPDATE pending_events
-            SET status = 'pending', updated_at = CURRENT_TIMESTAMP
-            WHERE status = 'processing' AND updated_at < ?
-            """,
-            (stale_time,),
-        )
-        await self._db.commit()
+        async with self.batch():
+            cursor = await self._db.execute(
+                """
+                UPDATE pending_events
+                SET status = 'pending', updated_at = ?
+                WHERE status = 'processing' AND updated_at < ?
+                """,
+                (now, stale_time),
+            )
         if cursor.rowcount > 0:
             logger.info("Reset %d stale events to pending", cursor.rowcount)
         return cursor.rowcount
@@ -626,50 +1330,69 @@ class Database:
         assert self._db is not None
 
         logger.debug("Resetting all processing events (startup recovery)")
-        cursor = await self._db.execute(
-            """
-            UPDATE pending_events
-            SET status = 'pending', updated_at = CURRENT_TIMESTAMP
-            WHERE status = 'processing'
-            """
-        )
-        await self._db.commit()
+        async with self.batch():
+            cursor = await self._db.execute(
+                """
+                UPDATE pending_events
+                SET status = 'pending', updated_at = ?
+                WHERE status = 'processing'
+                """,
+                (_now_ms(),),
+            )
         if cursor.rowcount > 0:
             logger.info("Startup recovery: reset %d events from processing to pending", cursor.rowcount)
         return cursor.rowcount
 
-    def _row_to_pending_event(self, row: aiosqlite.Row) -> PendingEvent:
-        """Convert a database row to PendingEvent model."""
-        return PendingEvent(
-            id=row["id"],
-            event_type=SyncEventType(row["event_type"]),
-            source_server=row["source_server"],
-            target_server=row["target_server"],
-            username=row["username"],
-            user_id=row["user_id"],
-            item_id=row["item_id"],
-            item_name=row["item_name"],
-            item_path=row["item_path"],
-            provider_imdb=row["provider_imdb"],
-            provider_tmdb=row["provider_tmdb"],
-            provider_tvdb=row["provider_tvdb"],
-            event_data=row["event_data"],
-            status=PendingEventStatus(row["status"]),
-            retry_count=row["retry_count"],
-            max_retries=row["max_retries"],
-            last_error=row["last_error"],
-            item_not_found_count=(row["item_not_found_count"] if "item_not_found_count" in row else 0),
-            item_not_found_max=(row["item_not_found_max"] if "item_not_found_max" in row else 0),
-            created_at=(
-                row["created_at"]
-                if isinstance(row["created_at"], datetime)
-                else datetime.fromisoformat(row["created_at"])
-            ),
-            updated_at=(
-                row["updated_at"]
-                if isinstance(row["updated_at"], datetime)
-                else datetime.fromisoformat(row["updated_at"])
-            ),
+    def _row_to_pending_event(self, row: Sequence[Any]) -> PendingEvent:
+        """Convert a row selected with PENDING_EVENT_COLUMNS to PendingEvent model.
+
+        Rows come from our own schema, so the model is built without re-validation.
+        """
+        (
+            event_id,
+            event_type,
+            source_server,
+            target_server,
+            username,
+            user_id,
+            item_id,
+            item_name,
+            item_path,
+            provider_imdb,
+            provider_tmdb,
+            provider_tvdb,
+            event_data,
+            status,
+            retry_count,
+            max_retries,
+            last_error,
+            item_not_found_count,
+            item_not_found_max,
+            created_at,
+            updated_at,
+        ) = row
+        return PendingEvent.model_construct(
+            id=event_id,
+            event_type=_SYNC_EVENT_TYPES[event_type],
+            source_server=source_server,
+            target_server=target_server,
+            username=username,
+            user_id=user_id,
+            item_id=item_id,
+            item_name=item_name,
+            item_path=item_path,
+            provider_imdb=provider_imdb,
+            provider_tmdb=provider_tmdb,
+            provider_tvdb=provider_tvdb,
+            event_data=event_data,
+            status=_EVENT_STATUSES[status],
+            retry_count=retry_count,
+            max_retries=max_retries,
+            last_error=last_error,
+            item_not_found_count=item_not_found_count,
+            item_not_found_max=item_not_found_max,
+            created_at=_from_ms(created_at),
+            updated_at=_from_ms(updated_at),
         )
 
     async def mark_event_waiting_for_item(
@@ -690,32 +1413,34 @@ class Database:
             retry_delay_seconds,
         )
 
-        await self._db.execute(
-            """
-            UPDATE pending_events
-            SET status = 'waiting_for_item',
-                item_not_found_count = item_not_found_count + 1,
-                item_not_found_max = ?,
-                last_error = ?,
-                next_retry_at = ?,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-            """,
-            (max_retries, error_message, next_retry.isoformat(), event_id),
-        )
-        await self._db.commit()
+        async with self.batch():
+            await self._db.execute(
+                """
+                UPDATE pending_events
+                SET status = 'waiting_for_item',
+                    item_not_found_count = item_not_found_count + 1,
+                    item_not_found_max = ?,
+                    last_error = ?,
+                    next_retry_at = ?,
+                    updated_at = ?
+                WHERE id = ?
+                """,
+                (max_retries, error_message, _to_ms(next_retry), _now_ms(), event_id),
+            )
 
     async def get_waiting_for_item_events(self, limit: int = 100) -> list[PendingEvent]:
-        """Get events waiting for items to be imported."""
+        """Get events waiting for items to be imported.
+
+        Read on the main connection for the same reason as get_pending_events.
+        """
         assert self._db is not None
 
         logger.debug("Fetching events waiting for item import (limit=%d)", limit)
-        now = datetime.now(UTC).isoformat()
-        events: list[PendingEvent] = []
+        now = _now_ms()
 
         async with self._db.execute(
-            """
-            SELECT * FROM pending_events
+            f"""
+            SELECT {PENDING_EVENT_COLUMNS} FROM pending_events
             WHERE status = 'waiting_for_item'
               AND (next_retry_at IS NULL OR next_retry_at <= ?)
             ORDER BY created_at ASC
@@ -723,8 +1448,9 @@ class Database:
             """,
             (now, limit),
         ) as cursor:
-            async for row in cursor:
-                events.append(self._row_to_pending_event(row))
+            cursor.row_factory = None  # plain tuples, unpacked positionally
+            rows = await cursor.fetchall()
+        events = [self._row_to_pending_event(row) for row in rows]
 
         if events:
             logger.debug("Found %d events ready for item retry", len(events))
@@ -734,11 +1460,7 @@ class Database:
         """Get count of events waiting for items."""
         assert self._db is not None
 
-        async with self._db.execute(
-            "SELECT COUNT(*) as count FROM pending_events WHERE status = 'waiting_for_item'"
-        ) as cursor:
-            row = await cursor.fetchone()
-            return row["count"] if row else 0
+        return await self._get_counter(COUNTER_EVENTS_PREFIX + "waiting_for_item")
 
     # ========== Statistics Methods ==========
 
@@ -746,68 +1468,102 @@ class Database:
         """Get count of events currently being processed."""
         assert self._db is not None
 
-        async with self._db.execute(
-            "SELECT COUNT(*) as count FROM pending_events WHERE status = 'processing'"
-        ) as cursor:
-            row = await cursor.fetchone()
-            return row["count"] if row else 0
+        return await self._get_counter(COUNTER_EVENTS_PREFIX + "processing")
 
     async def get_failed_count(self) -> int:
         """Get count of failed events (exceeded max retries)."""
         assert self._db is not None
 
-        async with self._db.execute("SELECT COUNT(*) as count FROM pending_events WHERE status = 'failed'") as cursor:
-            row = await cursor.fetchone()
-            return row["count"] if row else 0
+        return await self._get_counter(COUNTER_EVENTS_PREFIX + "failed")
+
+    async def get_event_counts(self) -> dict[str, int]:
+        """Get count of queued events per status in a single query.
+
+        Statuses with no events are absent from the result.
+        """
+        assert self._db is not None
+
+        async with self._reader().execute(
+            "SELECT substr(key, ?) as status, value FROM counters WHERE key LIKE ? AND value > 0",
+            (len(COUNTER_EVENTS_PREFIX) + 1, COUNTER_EVENTS_PREFIX + "%"),
+        ) as cursor:
+            return {row["status"]: row["value"] async for row in cursor}
+
+    async def get_table_counts(self) -> dict[str, int]:
+        """Get row counts of the user_mappings and sync_log tables in a single query."""
+        assert self._db is not None
+        await self.flush_sync_log()
+
+        async with self._reader().execute(
+            "SELECT key, value FROM counters WHERE key IN (?, ?)", (COUNTER_USER_MAPPINGS, COUNTER_SYNC_LOG)
+        ) as cursor:
+            counts = {row["key"]: row["value"] async for row in cursor}
+        return {name: counts.get(name, 0) for name in (COUNTER_USER_MAPPINGS, COUNTER_SYNC_LOG)}
 
     async def get_user_mappings_count(self) -> int:
         """Get count of user mappings."""
         assert self._db is not None
 
-        async with self._db.execute("SELECT COUNT(*) as count FROM user_mappings") as cursor:
-            row = await cursor.fetchone()
-            return row["count"] if row else 0
+        return await self._get_counter(COUNTER_USER_MAPPINGS)
 
     async def get_all_user_mappings(self) -> list[UserMapping]:
         """Get all user mappings."""
         assert self._db is not None
 
-        mappings: list[UserMapping] = []
-        async with self._db.execute(
+        async with self._reader().execute(
             """
             SELECT id, username, server_name, jellyfin_user_id, created_at, updated_at
             FROM user_mappings
             ORDER BY username, server_name
             """
         ) as cursor:
-            async for row in cursor:
-                mappings.append(
-                    UserMapping(
-                        id=row["id"],
-                        username=row["username"],
-                        server_name=row["server_name"],
-                        jellyfin_user_id=row["jellyfin_user_id"],
-                        created_at=row["created_at"],
-                        updated_at=row["updated_at"],
-                    )
-                )
+            rows = await cursor.fetchall()
+        mappings = [
+            UserMapping(
+                id=row["id"],
+                username=row["username"],
+                server_name=row["server_name"],
+                jellyfin_user_id=row["jellyfin_user_id"],
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
+            )
+            for row in rows
+        ]
         return mappings
 
+    async def get_user_server_ids(self) -> list[tuple[str, dict[str, str]]]:
+        """Get Jellyfin user IDs per server for every user, sorted by username.
+
+        The pivot is done in SQL: one row per username with a JSON object
+        mapping server_name -> jellyfin_user_id.
+        """
+        assert self._db is not None
+
+        async with self._reader().execute(
+            """
+            SELECT username, json_group_object(server_name, jellyfin_user_id) as servers
+            FROM user_mappings
+            GROUP BY username
+            ORDER BY username
+            """
+        ) as cursor:
+            return [(row["username"], json.loads(row["servers"])) async for row in cursor]
+
     async def get_sync_log_count(self) -> int:
         """Get count of sync log entries."""
         assert self._db is not None
+        await self.flush_sync_log()
 
-        async with self._db.execute("SELECT COUNT(*) as count FROM sync_log") as cursor:
-            row = await cursor.fetchone()
-            return row["count"] if row else 0
+        return await self._get_counter(COUNTER_SYNC_LOG)
 
     async def get_sync_stats(self) -> dict[str, object]:
         """Get sync statistics."""
         assert self._db is not None
+        await self.flush_sync_log()
 
         stats: dict[str, object] = {"total": 0, "successful": 0, "failed": 0, "last_sync_at": None}
 
-        async with self._db.execute(
+        async with self._reader().execute(
             """
             SELECT
                 COUNT(*) as total,
@@ -836,18 +1592,18 @@ class Database:
         assert self._db is not None
 
         logger.debug("Fetching failed events (limit=%d)", limit)
-        events: list[PendingEvent] = []
-        async with self._db.execute(
-            """
-            SELECT * FROM pending_events
+        async with self._reader().execute(
+            f"""
+            SELECT {PENDING_EVENT_COLUMNS} FROM pending_events
             WHERE status = 'failed'
             ORDER BY updated_at DESC
             LIMIT ?
             """,
             (limit,),
         ) as cursor:
-            async for row in cursor:
-                events.append(self._row_to_pending_event(row))
+            cursor.row_factory = None  # plain tuples, unpacked positionally
+            rows = await cursor.fetchall()
+        events = [self._row_to_pending_event(row) for row in rows]
 
         logger.debug("Found %d failed events", len(events))
         return events
@@ -857,18 +1613,18 @@ class Database:
         assert self._db is not None
 
         logger.debug("Resetting failed event %d for retry", event_id)
-        cursor = await self._db.execute(
-            """
-            UPDATE pending_events
-            SET status = 'pending',
-                retry_count = 0,
-                next_retry_at = NULL,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE id = ? AND status = 'failed'
-            """,
-            (event_id,),
-        )
-        await self._db.commit()
+        async with self.batch():
+            cursor = await self._db.execute(
+                """
+                UPDATE pending_events
+                SET status = 'pending',
+                    retry_count = 0,
+                    next_retry_at = NULL,
+                    updated_at = ?
+                WHERE id = ? AND status = 'failed'
+                """,
+                (_now_ms(), event_id),
+            )
         if cursor.rowcount > 0:
             logger.info("Event %d reset for retry", event_id)
         return cursor.rowcount > 0
@@ -882,6 +1638,7 @@ class Database:
         target_server: str | None = None,
         event_type: str | None = None,
         item_name: str | None = None,
+        item_name_prefix: bool = False,
     ) -> tuple[list[dict[str, object]], int]:
         """Get recent sync log entries with optional filtering.
 
@@ -893,136 +1650,127 @@ class Database:
             target_server: Filter by target server name (exact match)
             event_type: Filter by event type (exact match)
             item_name: Filter by item name (case-insensitive substring search)
+            item_name_prefix: Match item_name as a prefix instead of a substring
+                (uses the item name index; substring search scans every row)
 
         Returns:
             Tuple of (entries list, total count matching filters)
         """
         assert self._db is not None
+        await self.flush_sync_log()
 
-        entries: list[dict[str, object]] = []
-        conditions: list[str] = []
-        params: list[object] = []
-
-        # Time filter
-        if since_minutes is not None:
-            since_time = (datetime.now(UTC) - timedelta(minutes=since_minutes)).strftime("%Y-%m-%d %H:%M:%S")
-            conditions.append("created_at >= ?")
-            params.append(since_time)
-
-        # Server filters
-        if source_server:
-            conditions.append("source_server = ?")
-            params.append(source_server)
-        if target_server:
-            conditions.append("target_server = ?")
-            params.append(target_server)
-
-        # Event type filter
-        if event_type:
-            conditions.append("event_type = ?")
-            params.append(event_type)
-
-        # Item name filter (LIKE for substring search)
+        item_pattern = None
         if item_name:
-            conditions.append("item_name LIKE ?")
-            params.append(f"%{item_name}%")
-
-        # Build WHERE clause
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-        # Get total count first
-        count_query = f"SELECT COUNT(*) FROM sync_log WHERE {where_clause}"
-        async with self._db.execute(count_query, params) as cursor:
-            row = await cursor.fetchone()
-            total_count = row[0] if row else 0
+            pattern = _escape_like(item_name)
+            item_pattern = f"{pattern}%" if item_name_prefix else f"%{pattern}%"
+        # Parameters in _SYNC_LOG_FILTER_CONDITIONS order; None = filter not applied
+        filters = (
+            f"-{since_minutes} minutes" if since_minutes is not None else None,
+            source_server or None,
+            target_server or None,
+            event_type or None,
+            item_pattern,
+        )
+        params = [value for value in filters if value is not None]
+        count_query, query = _SYNC_LOG_QUERIES[tuple(value is not None for value in filters)]
+
+        # Get total count first (unfiltered: from the row counter, no scan)
+        if params:
+            async with self._reader().execute(count_query, params) as cursor:
+                row = await cursor.fetchone()
+                total_count = row[0] if row else 0
+        else:
+            total_count = await self._get_counter(COUNTER_SYNC_LOG)
 
-        # Build data query with pagination
-        query = f"""
-            SELECT id, event_type, source_server, target_server,
-                   username, item_id, item_name, synced_value, success, message, created_at
-            FROM sync_log
-            WHERE {where_clause}
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
-        """
         data_params = [*params, limit, offset]
+        async with self._reader().execute(query, data_params) as cursor:
+            rows = await cursor.fetchall()
 
-        async with self._db.execute(query, data_params) as cursor:
-            async for row in cursor:
-                entries.append(
-                    {
-                        "id": row["id"],
-                        "event_type": row["event_type"],
-                        "source_server": row["source_server"],
-                        "target_server": row["target_server"],
-                        "username": row["username"],
-                        "item_id": row["item_id"],
-                        "item_name": row["item_name"],
-                        "synced_value": row["synced_value"],
-                        "success": bool(row["success"]),
-                        "message": row["message"],
-                        "created_at": (
-                            row["created_at"].isoformat()
-                            if isinstance(row["created_at"], datetime)
-                            else row["created_at"]
-                        ),
-                    }
-                )
+        # Rows already have the response keys; only the stored 0/1 needs converting.
+        # created_at is returned as stored (TEXT), as detect_types is not enabled.
+        entries: list[dict[str, object]] = []
+        for row in rows:
+            entry = dict(row)
+            entry["success"] = bool(entry["success"])
+            entries.append(entry)
 
         return entries, total_count
 
     # ========== Item Path Cache Methods ==========
 
     async def get_cached_item_id(self, server_name: str, item_path: str) -> str | None:
-        """Get cached item ID for a path on a server."""
+        """Get cached item ID for a path on a server.
+
+        Recently resolved paths are answered from memory. Others are served by a
+        read-only connection: lookups made while syncing run concurrently with queue
+        writes, and a not-yet-committed cache entry is only a cache miss.
+
+        A result is kept in memory only if no other task's write could be pending or
+        land while it was read; otherwise a snapshot older than that write could
+        outlive it in memory.
+        """
         assert self._db is not None
 
-        async with self._db.execute(
+        key = (server_name, item_path)
+        cached = self._item_path_cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = self._item_cache_generation
+        settled = self._owns_batch() or not self._write_lock.locked()
+        async with self._reader().execute(
             """
             SELECT item_id FROM item_path_cache
             WHERE server_name = ? AND item_path = ?
             """,
-            (server_name, item_path),
+            key,
         ) as cursor:
             row = await cursor.fetchone()
-            if row:
-                logger.debug("[%s] Cache hit: %s", server_name, item_path[-50:])
-                return row["item_id"]
+        if not row:
             return None
 
+        logger.debug("[%s] Cache hit: %s", server_name, item_path[-50:])
+        if (
+            settled
+            and generation == self._item_cache_generation
+            and (self._owns_batch() or not self._write_lock.locked())
+        ):
+            self._item_path_cache.set(key, row["item_id"])
+        return row["item_id"]
+
     async def cache_item_path(
         self,
         server_name: str,
         item_path: str,
         item_id: str,
         item_name: str | None = None,
-        *,
-        commit: bool = True,
     ) -> None:
         """Cache a path to item ID mapping.
 
+        Several calls can share one commit inside batch().
+
         Args:
             server_name: Server name
             item_path: File path on server
             item_id: Jellyfin item ID
             item_name: Optional item name for debugging
-            commit: Whether to commit after insert (default True, set False for batch ops)
         """
         assert self._db is not None
 
-        await self._db.execute(
-            """
-            INSERT INTO item_path_cache (server_name, item_path, item_id, item_name, updated_at)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(server_name, item_path)
-            DO UPDATE SET item_id = excluded.item_id,
-                          item_name = excluded.item_name,
-                          updated_at = CURRENT_TIMESTAMP
-            """,
-            (server_name, item_path, item_id, item_name),
-        )
-        if commit:
-            await self._db.commit()
+        async with self.batch():
+            self._item_cache_generation += 1
+            await self._db.execute(
+                """
+                INSERT INTO item_path_cache (server_name, item_path, item_id, item_name, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(server_name, item_path)
+                DO UPDATE SET item_id = excluded.item_id,
+                              item_name = excluded.item_name,
+                              updated_at = CURRENT_TIMESTAMP
+                """,
+                (server_name, item_path, item_id, item_name),
+            )
+        self._item_path_cache.set((server_name, item_path), item_id)
 
     async def cache_items_batch(
         self,
@@ -1043,38 +1791,89 @@ class Database:
         if not items:
             return 0
 
-        await self._db.executemany(
-            """
-            INSERT INTO item_path_cache (server_name, item_path, item_id, item_name, updated_at)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(server_name, item_path)
-            DO UPDATE SET item_id = excluded.item_id,
-                          item_name = excluded.item_name,
-                          updated_at = CURRENT_TIMESTAMP
-            """,
-            [(server_name, path, item_id, name) for path, item_id, name in items],
-        )
-        await self._db.commit()
+        async with self.batch():
+            self._item_cache_generation += 1
+            # Full chunks go through one multi-row statement each (server_name bound once per
+            # chunk); the remainder reuses the per-row statement so the SQL text stays fixed
+            full = len(items) - len(items) % ITEM_CACHE_INSERT_CHUNK
+            for start in range(0, full, ITEM_CACHE_INSERT_CHUNK):
+                chunk = items[start : start + ITEM_CACHE_INSERT_CHUNK]
+                await self._db.execute(
+                    _INSERT_ITEM_CACHE_CHUNK_SQL, [*itertools.chain.from_iterable(chunk), server_name]
+                )
+            if full < len(items):
+                await self._db.executemany(
+                    """
+                    INSERT INTO item_path_cache (server_name, item_path, item_id, item_name, updated_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(server_name, item_path)
+                    DO UPDATE SET item_id = excluded.item_id,
+                                  item_name = excluded.item_name,
+                                  updated_at = CURRENT_TIMESTAMP
+                    """,
+                    [(server_name, path, item_id, name) for path, item_id, name in items[full:]],
+                )
+        # Drop rather than fill: a full library refresh would otherwise evict every hot entry
+        for path, _, _ in items:
+            self._item_path_cache.pop((server_name, path))
         logger.info("[%s] Cached %d items", server_name, len(items))
         return len(items)
 
-    async def invalidate_item_cache(self, server_name: str, item_path: str | None = None) -> int:
-        """Invalidate cached items. If item_path is None, invalidate all for server."""
+    async def invalidate_item_cache(
+        self,
+        server_name: str,
+        item_path: str | None = None,
+        *,
+        path_prefix: str | None = None,
+    ) -> int:
+        """Invalidate cached items.
+
+        Args:
+            server_name: Server name
+            item_path: Exact path to invalidate
+            path_prefix: Invalidate every path starting with this prefix (e.g. a moved
+                library folder; include the trailing separator)
+
+        If neither item_path nor path_prefix is given, invalidate all for server.
+        """
         assert self._db is not None
 
-        if item_path:
-            cursor = await self._db.execute(
-                "DELETE FROM item_path_cache WHERE server_name = ? AND item_path = ?",
-                (server_name, item_path),
-            )
-            logger.debug("[%s] Invalidated cache entry: %s", server_name, item_path[-50:])
-        else:
-            cursor = await self._db.execute(
-                "DELETE FROM item_path_cache WHERE server_name = ?",
-                (server_name,),
-            )
-            logger.info("[%s] Full cache invalidation: %d items removed", server_name, cursor.rowcount)
-        await self._db.commit()
+        async with self.batch():
+            self._item_cache_generation += 1
+            if item_path:
+                cursor = await self._db.execute(
+                    "DELETE FROM item_path_cache WHERE server_name = ? AND item_path = ?",
+                    (server_name, item_path),
+                )
+                self._item_path_cache.pop((server_name, item_path))
+                logger.debug("[%s] Invalidated cache entry: %s", server_name, item_path[-50:])
+            elif path_prefix:
+                # Half-open range on UNIQUE(server_name, item_path): one index range scan,
+                # no LIKE/GLOB escaping
+                upper = _prefix_upper_bound(path_prefix)
+                if upper is None:
+                    cursor = await self._db.execute(
+                        "DELETE FROM item_path_cache WHERE server_name = ? AND item_path >= ?",
+                        (server_name, path_prefix),
+                    )
+                else:
+                    cursor = await self._db.execute(
+                        "DELETE FROM item_path_cache WHERE server_name = ? AND item_path >= ? AND item_path < ?",
+                        (server_name, path_prefix, upper),
+                    )
+                for key in self._item_path_cache.keys():
+                    if key[0] == server_name and key[1].startswith(path_prefix):
+                        self._item_path_cache.pop(key)
+                logger.info(
+                    "[%s] Prefix cache invalidation %s: %d items removed", server_name, path_prefix, cursor.rowcount
+                )
+            else:
+                cursor = await self._db.execute(
+                    "DELETE FROM item_path_cache WHERE server_name = ?",
+                    (server_name,),
+                )
+                self._item_path_cache.clear()  # rare; not worth indexing entries by server
+                logger.info("[%s] Full cache invalidation: %d items removed", server_name, cursor.rowcount)
         return cursor.rowcount
 
     async def get_item_cache_count(self, server_name: str | None = None) -> int:
@@ -1082,55 +1881,43 @@ class Database:
         assert self._db is not None
 
         if server_name:
-            query = "SELECT COUNT(*) as count FROM item_path_cache WHERE server_name = ?"
-            params: tuple[str, ...] = (server_name,)
-        else:
-            query = "SELECT COUNT(*) as count FROM item_path_cache"
-            params = ()
-
-        async with self._db.execute(query, params) as cursor:
-            row = await cursor.fetchone()
-            return row["count"] if row else 0
+            return await self._get_counter(COUNTER_ITEM_CACHE_PREFIX + server_name)
+        return sum((await self.get_item_cache_stats()).values())
 
     async def get_item_cache_stats(self) -> dict[str, int]:
         """Get item cache count per server.
 
         Returns:
-            Dict mapping server_name to cached item count
+            Dict mapping server_name to cached item count (servers with no items are absent)
         """
         assert self._db is not None
 
-        stats: dict[str, int] = {}
-        async with self._db.execute(
-            """
-            SELECT server_name, COUNT(*) as count
-            FROM item_path_cache
-            GROUP BY server_name
-            ORDER BY server_name
-            """
+        async with self._reader().execute(
+            "SELECT substr(key, ?) as server_name, value FROM counters WHERE key LIKE ? AND value > 0 ORDER BY key",
+            (len(COUNTER_ITEM_CACHE_PREFIX) + 1, COUNTER_ITEM_CACHE_PREFIX + "%"),
         ) as cursor:
-            async for row in cursor:
-                stats[row["server_name"]] = row["count"]
+            return {row["server_name"]: row["value"] async for row in cursor}
 
-        return stats
+    async def get_database_size(self, max_age: float = DATABASE_SIZE_CACHE_TTL_SECONDS) -> int:
+        """Get the database size in bytes as SQLite sees it (page_count * page_size).
 
-    def get_database_size(self) -> int:
-        """Get database file size in bytes."""
-        try:
-            db_path = Path(self.db_path)
-            if db_path.exists():
-                # Main DB + WAL + SHM files
-                total_size = db_path.stat().st_size
-                wal_path = db_path.with_suffix(".db-wal")
-                shm_path = db_path.with_suffix(".db-shm")
-                if wal_path.exists():
-                    total_size += wal_path.stat().st_size
-                if shm_path.exists():
-                    total_size += shm_path.stat().st_size
-                return total_size
-        except OSError:
-            pass
-        return 0
+        Includes pages committed to the WAL but not yet checkpointed, unlike the size of
+        the main file on disk. Results younger than max_age seconds are reused.
+        """
+        assert self._db is not None
+
+        cached = self._size_cache
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+
+        async with self._reader().execute(
+            "SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()"
+        ) as cursor:
+            cursor.row_factory = None
+            row = await cursor.fetchone()
+        size = row[0] if row else 0
+        self._size_cache = (time.monotonic(), size)
+        return size
 
 
 # Global database instance
@@ -13,8 +13,15 @@ from ..config import ServerConfig
 logger = logging.getLogger(__name__)
 
 # Connection pool limits
+# Clients are long-lived (one per server, owned by SyncEngine), so keep idle sockets
+# around between sporadic webhooks instead of httpx's 5s default; Jellyfin's
+# (Kestrel) server-side keep-alive timeout is longer than this
 DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
-DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+DEFAULT_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=60.0)
+
+# Max in-flight requests per client; bursts of webhooks queue here instead of
+# opening sockets up to the pool limit and waiting on the pool timeout
+DEFAULT_MAX_CONCURRENCY = 10
 
 # Lock for cache refresh per server (prevents parallel refreshes)
 _cache_refresh_locks: dict[str, asyncio.Lock] = {}
@@ -39,7 +46,7 @@ DEVICE_ID = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{_PKG_NAME}.local"))
 class JellyfinClient:
     """Async client for Jellyfin API."""
 
-    def __init__(self, server: ServerConfig):
+    def __init__(self, server: ServerConfig, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
         self.server = server
         self.base_url = server.url.rstrip("/")
         # Use proper Jellyfin authorization header format
@@ -57,6 +64,7 @@ class JellyfinClient:
         }
         self._client: httpx.AsyncClient | None = None
         self._admin_user_id: str | None = None  # Cached admin user ID for item lookups
+        self._semaphore = asyncio.Semaphore(max_concurrency)
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create the shared HTTP client."""
@@ -82,12 +90,13 @@ class JellyfinClient:
         """Make an authenticated request to the Jellyfin API."""
         url = f"{self.base_url}{endpoint}"
         client = await self._get_client()
-        response = await client.request(
-            method,
-            url,
-            headers=self.headers,
-            **kwargs,
-        )
+        async with self._semaphore:
+            response = await client.request(
+                method,
+                url,
+                headers=self.headers,
+                **kwargs,
+            )
         response.raise_for_status()
         return response
 
@@ -144,18 +153,21 @@ class JellyfinClient:
         logger.error("[%s] No admin user found! Item lookups will fail.", self.server.name)
         return None
 
-    async def create_user(self, username: str, password: str | None = None) -> dict[str, Any] | None:
+    async def ensure_user(self, username: str, password: str | None = None) -> tuple[dict[str, Any] | None, bool]:
         """
-        Create a new user on the server.
+        Create a user, or fall back to the existing one if the name is taken.
+
+        The create is attempted first, so a new user costs a single round trip;
+        the user list is only fetched when the server reports that the name is
+        taken. Other rejections are failures.
 
         Args:
             username: The username for the new user
             password: Password for the user (None for passwordless servers)
 
         Returns:
-            User data dict if successful, None otherwise
+            Tuple of (user data dict or None on failure, True if the user was created)
         """
-        logger.info("[%s] Creating user '%s'", self.server.name, username)
         try:
             response = await self._request(
                 "POST",
@@ -165,15 +177,21 @@ class JellyfinClient:
                     "Password": password or "",
                 },
             )
-            user = response.json()
-            logger.info("[%s] Created user '%s' -> %s", self.server.name, username, user.get("Id"))
-            return user
         except httpx.HTTPStatusError as e:
-            if e.response.status_code == 400:
-                logger.warning("[%s] User '%s' already exists", self.server.name, username)
-            else:
+            # Jellyfin answers a duplicate name with 400 "A user with the name '...' already exists."
+            if e.response.status_code != 400 or "already exists" not in e.response.text:
                 logger.error("[%s] Failed to create user '%s': %s", self.server.name, username, e)
-            return None
+                return None, False
+            existing = await self.get_user_by_name(username)
+            if existing is None:
+                logger.error("[%s] User '%s' was rejected but does not exist: %s", self.server.name, username, e)
+            else:
+                logger.debug("[%s] User '%s' already exists", self.server.name, username)
+            return existing, False
+
+        user = response.json()
+        logger.info("[%s] Created user '%s' -> %s", self.server.name, username, user.get("Id"))
+        return user, True
 
     async def delete_user(self, user_id: str) -> bool:
         """
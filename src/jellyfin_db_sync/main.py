@@ -13,6 +13,7 @@ from fastapi import FastAPI
 from .api import health_router, status_router, webhook_router
 from .config import get_config, load_config
 from .database import close_db, get_db
+from .profiling import install_profiler
 from .sync import SyncEngine
 from .web import get_static_files, ui_router
 
@@ -100,6 +101,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info("Shutting down jellyfin-db-sync...")
     await engine.stop_worker()
+    await engine.close()
     await close_db()
 
 
@@ -115,6 +117,9 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    if get_config().server.profiling:
+        install_profiler(app)
+
     # Mount static files
     app.mount("/static", get_static_files(), name="static")
 
@@ -136,6 +141,8 @@ def main() -> None:
         app,
         host=config.server.host,
         port=config.server.port,
+        loop=config.server.loop,
+        http=config.server.http,
         log_level=config.logging.level.lower(),
     )
 
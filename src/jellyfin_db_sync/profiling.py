@@ -0,0 +1,43 @@
+"""On-demand request profiling with pyinstrument (optional dependency)."""
+
+import logging
+from collections.abc import Awaitable, Callable
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import HTMLResponse
+
+logger = logging.getLogger(__name__)
+
+# Sampling interval for profiled requests (seconds)
+PROFILER_INTERVAL_SECONDS = 0.001
+
+
+def install_profiler(app: FastAPI) -> bool:
+    """Add a middleware that profiles requests carrying an X-Profile header or ?profile=1.
+
+    A profiled request returns the pyinstrument HTML report instead of its normal
+    response. Other requests pass straight through.
+
+    Returns False if pyinstrument is not installed (pip install jellyfin-db-sync[profiling]).
+    """
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        logger.warning("Profiling enabled but pyinstrument is not installed, skipping profiler middleware")
+        return False
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+        if not (request.headers.get("X-Profile") or request.query_params.get("profile")):
+            return await call_next(request)
+
+        profiler = Profiler(interval=PROFILER_INTERVAL_SECONDS, async_mode="enabled")
+        profiler.start()
+        try:
+            await call_next(request)
+        finally:
+            profiler.stop()
+        return HTMLResponse(profiler.output_html())
+
+    logger.warning("Request profiling enabled (X-Profile header or ?profile=1); do not use in production")
+    return True
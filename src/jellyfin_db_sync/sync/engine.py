@@ -2,12 +2,14 @@
 
 import asyncio
 import contextlib
-import json
 import logging
+import time
 from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+from pydantic_core import from_json
+
 from ..config import Config, ServerConfig, get_config
 from ..database import get_db
 from ..jellyfin import JellyfinClient
@@ -20,12 +22,28 @@ logger = logging.getLogger(__name__)
 # When we sync item X to server B, ignore webhooks from B about item X for this duration
 SYNC_COOLDOWN_SECONDS = 30
 
+# Max number of accepted webhooks written to the queue per batch
+INBOX_BATCH_SIZE = 256
+
+# Max time to wait for accepted webhooks to be queued on shutdown (seconds)
+INBOX_DRAIN_TIMEOUT_SECONDS = 10.0
+
+# Max time a single server health probe may take before it counts as unhealthy (seconds)
+HEALTH_CHECK_TIMEOUT_SECONDS = 2.0
+
+# How long server health results are reused by the status/readiness endpoints (seconds)
+# A dashboard auto-refresh would otherwise probe every server on each request
+HEALTH_CACHE_TTL_SECONDS = 2.0
+
+# How long a server's reported Jellyfin version is reused (seconds); it only changes on upgrade
+SERVER_VERSION_CACHE_TTL_SECONDS = 300.0
+
 
 class SyncEngine:
     """Engine for syncing user data across Jellyfin servers.
 
     Architecture:
-    1. Webhook → enqueue_events() → pending_events table (WAL)
+    1. Webhook → submit_events() → in-memory inbox → enqueue_events_batch() → pending_events table (WAL)
     2. Worker loop → process_pending_events() → Jellyfin API → sync_log
     """
 
@@ -35,20 +53,40 @@ class SyncEngine:
         self._last_progress_sync: dict[str, datetime] = {}
         self._running = False
         self._worker_task: asyncio.Task[None] | None = None
+        # Accepted webhooks waiting to be written to pending_events
+        self._inbox: asyncio.Queue[tuple[WebhookPayload, str]] = asyncio.Queue(maxsize=self.config.sync.inbox_max_size)
+        self._inbox_task: asyncio.Task[None] | None = None
         # Cooldown tracking: key = "server:username:item_id:event_type" -> expiry time
         # Prevents sync loops by ignoring return webhooks after we just synced
         self._sync_cooldowns: dict[str, datetime] = {}
-
-    def _get_client(self, server: ServerConfig) -> JellyfinClient:
-        """Get or create a client for a server."""
+        # Short-lived health check cache: (monotonic timestamp, results)
+        self._health_cache: tuple[float, dict[str, bool]] | None = None
+        self._health_lock = asyncio.Lock()
+        # Server name -> (monotonic timestamp, version); only answered probes are cached
+        self._version_cache: dict[str, tuple[float, str]] = {}
+
+    @property
+    def worker_running(self) -> bool:
+        """Whether the background worker is running."""
+        return self._running
+
+    def get_client(self, server: ServerConfig) -> JellyfinClient:
+        """Get or create the pooled client for a server.
+
+        Clients keep their HTTP connection pool between calls, so callers should
+        reuse these instead of constructing a JellyfinClient per request.
+        """
         if server.name not in self._clients:
-            self._clients[server.name] = JellyfinClient(server)
+            self._clients[server.name] = JellyfinClient(server, self.config.sync.per_server_concurrency)
         return self._clients[server.name]
 
-    def _should_sync_progress(self, key: str) -> bool:
-        """Check if enough time has passed for progress sync (debounce)."""
+    def _should_sync_progress(self, key: str, pending: dict[str, datetime] | None = None) -> bool:
+        """Check if enough time has passed for progress sync (debounce).
+
+        Timestamps in `pending` (not yet committed) take precedence over the recorded ones.
+        """
         now = datetime.now(UTC)
-        last_sync = self._last_progress_sync.get(key)
+        last_sync = (pending or {}).get(key) or self._last_progress_sync.get(key)
 
         if last_sync is None:
             return True
@@ -161,6 +199,58 @@ class SyncEngine:
 
     # ========== Producer: Webhook → WAL ==========
 
+    def submit_events(self, payload: WebhookPayload, source_server_name: str) -> bool:
+        """
+        Accept a webhook for enqueueing without waiting for the database write.
+
+        Returns False if the inbox is full (caller should apply back-pressure).
+        """
+        try:
+            self._inbox.put_nowait((payload, source_server_name))
+        except asyncio.QueueFull:
+            logger.warning(
+                "Webhook inbox full (%d), rejecting %s from %s", self._inbox.maxsize, payload.event, source_server_name
+            )
+            return False
+        return True
+
+    async def _inbox_loop(self) -> None:
+        """Write accepted webhooks to the pending_events table, batching whatever has piled up."""
+        while True:
+            batch = [await self._inbox.get()]
+            while len(batch) < INBOX_BATCH_SIZE:
+                try:
+                    batch.append(self._inbox.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                counts = await self.enqueue_events_batch(batch)
+            except Exception as e:
+                # One bad webhook must not take the rest of the batch down with it
+                logger.warning("Failed to enqueue %d webhooks as a batch, retrying one by one: %s", len(batch), e)
+                counts = []
+                for payload, source_server_name in batch:
+                    try:
+                        counts.append(await self.enqueue_events(payload, source_server_name))
+                    except Exception as exc:
+                        logger.exception(
+                            "[%s] Failed to enqueue %s webhook: %s", source_server_name, payload.event, exc
+                        )
+                        counts.append(0)
+            finally:
+                for _ in batch:
+                    self._inbox.task_done()
+            for (payload, source_server_name), enqueued in zip(batch, counts, strict=True):
+                if enqueued > 0:
+                    logger.info(
+                        "[%s] Enqueued %d events: %s %s for %s",
+                        source_server_name,
+                        enqueued,
+                        payload.event,
+                        payload.item_name,
+                        payload.username,
+                    )
+
     async def enqueue_events(
         self,
         payload: WebhookPayload,
@@ -171,121 +261,155 @@ class SyncEngine:
 
         Returns number of events enqueued.
         """
-        db = await get_db()
+        counts = await self.enqueue_events_batch([(payload, source_server_name)])
+        return counts[0]
 
-        # Log all incoming webhooks in detail (DEBUG level)
-        logger.debug(
-            "[WEBHOOK] server=%s, event=%s, user=%s, item=%s, path=%s, played=%s, favorite=%s, position=%s, imdb=%s",
-            source_server_name,
-            payload.event,
-            payload.username,
-            payload.item_name,
-            payload.item_path,
-            payload.is_played,
-            payload.is_favorite,
-            payload.playback_position_ticks,
-            payload.provider_imdb,
-        )
+    async def enqueue_events_batch(self, webhooks: list[tuple[WebhookPayload, str]]) -> list[int]:
+        """
+        Enqueue sync events from several webhooks, writing them in one batch.
 
-        # Periodic cleanup of expired cooldowns
-        self._cleanup_expired_cooldowns()
+        Args:
+            webhooks: (payload, source_server_name) pairs, in arrival order
 
-        # Ensure user mapping exists for source server
-        await db.upsert_user_mapping(
-            username=payload.username,
-            server_name=source_server_name,
-            jellyfin_user_id=payload.user_id,
-        )
+        Returns number of events enqueued per webhook.
+        """
+        db = await get_db()
 
-        # Parse webhook into event data
-        events_data = self._parse_webhook_to_event_data(payload, source_server_name)
+        # Periodic cleanup of expired cooldowns
+        self._cleanup_expired_cooldowns()
 
-        # Filter out events that are in cooldown (prevent sync loops)
-        # If we recently synced this item TO source_server, ignore webhooks FROM source_server
-        events_before_filter = len(events_data)
-        events_data = [
-            e
-            for e in events_data
-            if not self._is_in_cooldown(
+        mappings: list[tuple[str, str, str]] = []
+        rows: list[dict[str, Any]] = []
+        # Progress debounce timestamps, recorded only once the rows are written: if the write
+        # fails, a retry of the same webhooks must not be debounced by this attempt
+        progress_stamps: dict[str, datetime] = {}
+        # Duplicates within the batch aren't in the table yet, so track them here
+        batch_keys: set[tuple[SyncEventType, str, str, str]] = set()
+        counts: list[int] = []
+
+        for payload, source_server_name in webhooks:
+            # Log all incoming webhooks in detail (DEBUG level)
+            logger.debug(
+                "[WEBHOOK] server=%s, event=%s, user=%s, item=%s, path=%s, played=%s, favorite=%s, position=%s, "
+                "imdb=%s",
                 source_server_name,
+                payload.event,
                 payload.username,
+                payload.item_name,
                 payload.item_path,
-                e["event_type"],
+                payload.is_played,
+                payload.is_favorite,
+                payload.playback_position_ticks,
                 payload.provider_imdb,
-                payload.provider_tmdb,
-                payload.provider_tvdb,
             )
-        ]
 
-        # Log filtered events
-        if events_before_filter > len(events_data):
-            filtered = events_before_filter - len(events_data)
+            # Ensure user mapping exists for source server
+            mappings.append((payload.username, source_server_name, payload.user_id))
+
+            # Parse webhook into event data
+            events_data = self._parse_webhook_to_event_data(payload, source_server_name, progress_stamps)
+
+            # Filter out events that are in cooldown (prevent sync loops)
+            # If we recently synced this item TO source_server, ignore webhooks FROM source_server
+            events_before_filter = len(events_data)
+            events_data = [
+                e
+                for e in events_data
+                if not self._is_in_cooldown(
+                    source_server_name,
+                    payload.username,
+                    payload.item_path,
+                    e["event_type"],
+                    payload.provider_imdb,
+                    payload.provider_tmdb,
+                    payload.provider_tvdb,
+                )
+            ]
+
+            # Log filtered events
+            if events_before_filter > len(events_data):
+                filtered = events_before_filter - len(events_data)
+                logger.debug(
+                    "[COOLDOWN] Filtered %d events from %s for %s (prevented sync loop)",
+                    filtered,
+                    source_server_name,
+                    payload.item_name,
+                )
+
+            if not events_data:
+                logger.debug("No sync events generated from webhook: %s", payload.event)
+                counts.append(0)
+                continue
+
+            # Get target servers
+            target_servers = self.config.get_other_servers(source_server_name)
+
+            # Enqueue event for each target server
+            enqueued = 0
+            for event_data in events_data:
+                for target_server in target_servers:
+                    # Deduplication: skip if similar event already pending
+                    key = (event_data["event_type"], target_server.name, payload.username, payload.item_id)
+                    if key in batch_keys or await db.has_pending_event(
+                        event_type=event_data["event_type"],
+                        target_server=target_server.name,
+                        username=payload.username,
+                        item_id=payload.item_id,
+                    ):
+                        logger.debug(
+                            "Skipping duplicate event: %s for %s -> %s",
+                            event_data["event_type"].value,
+                            payload.item_name,
+                            target_server.name,
+                        )
+                        continue
+
+                    batch_keys.add(key)
+                    rows.append(
+                        {
+                            "event_type": event_data["event_type"],
+                            "source_server": source_server_name,
+                            "target_server": target_server.name,
+                            "username": payload.username,
+                            "user_id": payload.user_id,
+                            "item_id": payload.item_id,
+                            "item_name": payload.item_name,
+                            "event_data": event_data["data"],
+                            "item_path": payload.item_path,  # Primary: path-based matching
+                            "provider_imdb": payload.provider_imdb,  # Fallback: provider IDs
+                            "provider_tmdb": payload.provider_tmdb,
+                            "provider_tvdb": payload.provider_tvdb,
+                        }
+                    )
+                    enqueued += 1
+
             logger.debug(
-                "[COOLDOWN] Filtered %d events from %s for %s (prevented sync loop)",
-                filtered,
+                "Enqueued %d events from %s: event=%s, user=%s, item=%s",
+                enqueued,
                 source_server_name,
+                payload.event,
+                payload.username,
                 payload.item_name,
             )
+            counts.append(enqueued)
 
-        if not events_data:
-            logger.debug("No sync events generated from webhook: %s", payload.event)
-            return 0
-
-        # Get target servers
-        target_servers = self.config.get_other_servers(source_server_name)
-
-        # Enqueue event for each target server
-        enqueued = 0
-        for event_data in events_data:
-            for target_server in target_servers:
-                # Deduplication: skip if similar event already pending
-                if await db.has_pending_event(
-                    event_type=event_data["event_type"],
-                    target_server=target_server.name,
-                    username=payload.username,
-                    item_id=payload.item_id,
-                ):
-                    logger.debug(
-                        "Skipping duplicate event: %s for %s -> %s",
-                        event_data["event_type"].value,
-                        payload.item_name,
-                        target_server.name,
-                    )
-                    continue
-
-                await db.add_pending_event(
-                    event_type=event_data["event_type"],
-                    source_server=source_server_name,
-                    target_server=target_server.name,
-                    username=payload.username,
-                    user_id=payload.user_id,
-                    item_id=payload.item_id,
-                    item_name=payload.item_name,
-                    event_data=event_data["data"],
-                    item_path=payload.item_path,  # Primary: path-based matching
-                    provider_imdb=payload.provider_imdb,  # Fallback: provider IDs
-                    provider_tmdb=payload.provider_tmdb,
-                    provider_tvdb=payload.provider_tvdb,
-                )
-                enqueued += 1
-
-        logger.debug(
-            "Enqueued %d events from %s: event=%s, user=%s, item=%s",
-            enqueued,
-            source_server_name,
-            payload.event,
-            payload.username,
-            payload.item_name,
-        )
-
-        return enqueued
+        async with db.batch():
+            await db.upsert_user_mappings(mappings)
+            await db.add_pending_events(rows)
+        self._last_progress_sync.update(progress_stamps)
+        return counts
 
     def _parse_webhook_to_event_data(
         self,
         payload: WebhookPayload,
         source_server: str,
+        progress_stamps: dict[str, datetime] | None = None,
     ) -> list[dict[str, Any]]:
-        """Parse webhook payload into event data for queueing."""
+        """Parse webhook payload into event data for queueing.
+
+        Progress debounce timestamps go to `progress_stamps` when given (the caller
+        records them after committing), otherwise they are recorded immediately.
+        """
         events: list[dict[str, Any]] = []
 
         # Handle different event types
@@ -304,14 +428,17 @@ class SyncEngine:
             if self.config.sync.playback_progress and payload.playback_position_ticks:
                 # Debounce check
                 debounce_key = f"{source_server}:{payload.username}:{payload.item_id}"
-                if self._should_sync_progress(debounce_key):
+                if self._should_sync_progress(debounce_key, progress_stamps):
                     events.append(
                         {
                             "event_type": SyncEventType.PROGRESS,
                             "data": {"position_ticks": payload.playback_position_ticks},
                         }
                     )
-                    self._update_progress_timestamp(debounce_key)
+                    if progress_stamps is None:
+                        self._update_progress_timestamp(debounce_key)
+                    else:
+                        progress_stamps[debounce_key] = datetime.now(UTC)
 
         elif payload.event == "UserDataSaved":
             # Skip Import events - these are bulk operations (migration, restore, etc.)
@@ -405,19 +532,37 @@ class SyncEngine:
             logger.info("Reset %d events stuck in processing from previous run", reset_count)
 
         self._running = True
+        self._inbox_task = asyncio.create_task(self._inbox_loop())
         self._worker_task = asyncio.create_task(self._worker_loop(interval_seconds))
         logger.info("Sync worker started")
 
     async def stop_worker(self) -> None:
-        """Stop the background worker."""
+        """Stop the background worker, first queueing any webhooks already accepted."""
         self._running = False
-        if self._worker_task:
-            self._worker_task.cancel()
+        if self._inbox_task:
+            try:
+                async with asyncio.timeout(INBOX_DRAIN_TIMEOUT_SECONDS):
+                    await self._inbox.join()
+            except TimeoutError:
+                logger.warning("Timed out draining webhook inbox, %d webhooks dropped", self._inbox.qsize())
+
+        # Cancel both tasks before awaiting either, so neither gets scheduled again
+        tasks = [task for task in (self._inbox_task, self._worker_task) if task is not None]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
             with contextlib.suppress(asyncio.CancelledError):
-                await self._worker_task
-            self._worker_task = None
+                await task
+        self._inbox_task = None
+        self._worker_task = None
         logger.info("Sync worker stopped")
 
+    async def close(self) -> None:
+        """Close pooled Jellyfin clients and their HTTP connections."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+
     async def _worker_loop(self, interval_seconds: float) -> None:
         """Main worker loop that processes pending events."""
         db = await get_db()
@@ -451,16 +596,12 @@ class SyncEngine:
             max_concurrent: Maximum number of events to process in parallel
         """
         db = await get_db()
-        events = await db.get_pending_events(limit=limit)
+        # Fetched and marked as processing in one statement
+        events = await db.claim_pending_events(limit=limit)
 
         if not events:
             return 0
 
-        # Mark all as processing first
-        for event in events:
-            assert event.id is not None
-            await db.mark_event_processing(event.id)
-
         # Process in parallel with semaphore to limit concurrency
         semaphore = asyncio.Semaphore(max_concurrent)
 
@@ -502,10 +643,11 @@ class SyncEngine:
         if not events:
             return 0
 
-        # Mark all as processing first
-        for event in events:
-            assert event.id is not None
-            await db.mark_event_processing(event.id)
+        # Mark all as processing first (one commit for the whole batch)
+        async with db.batch():
+            for event in events:
+                assert event.id is not None
+                await db.mark_event_processing(event.id)
 
         # Process in parallel with semaphore to limit concurrency
         semaphore = asyncio.Semaphore(max_concurrent)
@@ -547,7 +689,7 @@ class SyncEngine:
                 message=f"Target server '{event.target_server}' not found in config",
             )
 
-        client = self._get_client(target_server)
+        client = self.get_client(target_server)
         db = await get_db()
 
         try:
@@ -608,7 +750,7 @@ class SyncEngine:
             )
 
             # Execute the sync operation
-            event_data = json.loads(event.event_data)
+            event_data = from_json(event.event_data)
             success, synced_value = await self._execute_sync(
                 client=client,
                 user_id=target_user_id,
@@ -939,37 +1081,50 @@ class SyncEngine:
         """Discover and sync all user mappings across servers."""
         db = await get_db()
 
-        # Collect users from all servers
+        # Collect users from all servers (fetched concurrently)
         all_users: dict[str, dict[str, str]] = {}  # username -> {server: user_id}
 
-        for server in self.config.servers:
-            client = self._get_client(server)
-            try:
-                users = await client.get_users()
-                for user in users:
-                    username = user.get("Name", "").lower()
-                    user_id = user.get("Id", "")
-                    if username and user_id:
-                        if username not in all_users:
-                            all_users[username] = {}
-                        all_users[username][server.name] = user_id
-            except Exception as e:
-                logger.error("Failed to get users from %s: %s", server.name, e)
-
-        # Save mappings
-        for username, servers in all_users.items():
-            for server_name, user_id in servers.items():
-                await db.upsert_user_mapping(username, server_name, user_id)
+        server_users = await asyncio.gather(
+            *(self.get_client(server).get_users() for server in self.config.servers), return_exceptions=True
+        )
+        for server, users in zip(self.config.servers, server_users, strict=True):
+            if isinstance(users, BaseException):
+                logger.error("Failed to get users from %s: %s", server.name, users)
+                continue
+            for user in users:
+                username = user.get("Name", "").lower()
+                user_id = user.get("Id", "")
+                if username and user_id:
+                    if username not in all_users:
+                        all_users[username] = {}
+                    all_users[username][server.name] = user_id
+
+        # Save mappings (one transaction instead of a commit per mapping)
+        await db.upsert_user_mappings(
+            [
+                (username, server_name, user_id)
+                for username, servers in all_users.items()
+                for server_name, user_id in servers.items()
+            ]
+        )
 
         logger.info("Synced %d users across servers", len(all_users))
 
-    async def health_check_all(self) -> dict[str, bool]:
-        """Check health of all configured servers."""
+    async def health_check_all(self, per_server_timeout: float = HEALTH_CHECK_TIMEOUT_SECONDS) -> dict[str, bool]:
+        """Check health of all configured servers concurrently.
+
+        A server that doesn't answer within per_server_timeout seconds is reported
+        unhealthy, so one slow server can't stall the whole check.
+        """
         results: dict[str, bool] = {}
 
         async def check_server(server: ServerConfig) -> tuple[str, bool]:
-            client = self._get_client(server)
-            healthy = await client.health_check()
+            client = self.get_client(server)
+            try:
+                healthy = await asyncio.wait_for(client.health_check(), timeout=per_server_timeout)
+            except TimeoutError:
+                logger.warning("[%s] Health check timed out after %ss", server.name, per_server_timeout)
+                healthy = False
             return server.name, healthy
 
         tasks = [check_server(s) for s in self.config.servers]
@@ -978,14 +1133,52 @@ class SyncEngine:
 
         return results
 
-    async def get_server_versions(self) -> dict[str, str | None]:
-        """Get Jellyfin version for all configured servers."""
+    async def cached_health_check_all(self, max_age: float = HEALTH_CACHE_TTL_SECONDS) -> dict[str, bool]:
+        """Check health of all servers, reusing results younger than max_age seconds.
+
+        Concurrent callers are coalesced: only one probe round runs at a time,
+        and callers waiting on the lock pick up its fresh result.
+        """
+        cached = self._health_cache
+        if cached is not None and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+
+        async with self._health_lock:
+            cached = self._health_cache
+            if cached is not None and time.monotonic() - cached[0] < max_age:
+                return cached[1]
+
+            results = await self.health_check_all()
+            self._health_cache = (time.monotonic(), results)
+            return results
+
+    async def get_server_versions(
+        self,
+        per_server_timeout: float = HEALTH_CHECK_TIMEOUT_SECONDS,
+        max_age: float = SERVER_VERSION_CACHE_TTL_SECONDS,
+    ) -> dict[str, str | None]:
+        """Get Jellyfin version for all configured servers.
+
+        Versions younger than max_age seconds are reused without a request. A server
+        that doesn't answer within per_server_timeout seconds is reported as None
+        (and probed again next time), like an unhealthy server in health_check_all.
+        """
         results: dict[str, str | None] = {}
 
         async def get_version(server: ServerConfig) -> tuple[str, str | None]:
-            client = self._get_client(server)
-            info = await client.get_server_info()
+            cached = self._version_cache.get(server.name)
+            if cached is not None and time.monotonic() - cached[0] < max_age:
+                return server.name, cached[1]
+
+            client = self.get_client(server)
+            try:
+                info = await asyncio.wait_for(client.get_server_info(), timeout=per_server_timeout)
+            except TimeoutError:
+                logger.warning("[%s] Server info request timed out after %ss", server.name, per_server_timeout)
+                return server.name, None
             version = info.get("Version") if info else None
+            if version:
+                self._version_cache[server.name] = (time.monotonic(), version)
             return server.name, version
 
         tasks = [get_version(s) for s in self.config.servers]
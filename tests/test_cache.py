@@ -0,0 +1,48 @@
+"""Tests for in-process caches."""
+
+from unittest.mock import patch
+
+from jellyfin_db_sync.cache import TTLCache
+
+
+def test_cache_get_set():
+    """Test storing and retrieving values."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10)
+    assert cache.get("a") is None
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert len(cache) == 1
+
+    cache.set("b", 2)
+    assert cache.keys() == ["a", "b"]
+
+    cache.pop("a")
+    assert cache.get("a") is None
+    assert cache.keys() == ["b"]
+
+
+def test_cache_evicts_least_recently_used():
+    """Test LRU eviction when maxsize is exceeded."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_entries_expire():
+    """Test entries are dropped after the TTL."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=5.0)
+
+    with patch("jellyfin_db_sync.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("jellyfin_db_sync.cache.time.monotonic", return_value=104.0):
+        assert cache.get("a") == 1
+    with patch("jellyfin_db_sync.cache.time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
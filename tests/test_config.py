@@ -1,11 +1,15 @@
 """Tests for configuration loading."""
 
+import os
 import tempfile
 from pathlib import Path
 
+import pytest
 import yaml
+from pydantic import ValidationError
 
-from jellyfin_db_sync.config import Config, ServerConfig, SyncConfig
+import jellyfin_db_sync.config as config_module
+from jellyfin_db_sync.config import Config, PathSyncPolicy, ServerConfig, SyncConfig, load_config
 
 
 def test_server_config_creation():
@@ -47,6 +51,7 @@ def test_config_get_server():
     assert config.get_server("wan").url == "http://wan:8096"
     assert config.get_server("lan") is not None
     assert config.get_server("unknown") is None
+    assert config.server_names == ("wan", "lan")
 
 
 def test_config_from_yaml():
@@ -84,3 +89,80 @@ def test_config_from_yaml():
         assert config.servers[0].passwordless is True
     finally:
         config_path.unlink()
+
+
+def test_load_config_reuses_unchanged_file(tmp_path, monkeypatch):
+    """Test reloading an unchanged file returns the same config, and a changed one is parsed again."""
+    monkeypatch.setattr(config_module, "_config", None)
+    monkeypatch.setattr(config_module, "_config_source", None)
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.dump({"servers": [{"name": "wan", "url": "http://wan:8096", "api_key": "k"}]}))
+
+    first = load_config(config_path)
+    assert load_config(config_path) is first
+
+    config_path.write_text(yaml.dump({"servers": [{"name": "lan", "url": "http://lan:8096", "api_key": "k"}]}))
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    reloaded = load_config(config_path)
+    assert reloaded is not first
+    assert reloaded.server_names == ("lan",)
+
+
+def test_config_get_other_servers():
+    """Test Config.get_other_servers excludes only the named server."""
+    config = Config(
+        servers=[
+            ServerConfig(name="wan", url="http://wan:8096", api_key="key1"),
+            ServerConfig(name="lan", url="http://lan:8096", api_key="key2"),
+            ServerConfig(name="backup", url="http://backup:8096", api_key="key3"),
+        ],
+    )
+
+    assert [s.name for s in config.get_other_servers("lan")] == ["wan", "backup"]
+    assert [s.name for s in config.get_other_servers("unknown")] == ["wan", "lan", "backup"]
+
+
+def test_config_get_path_policy_prefers_longest_prefix():
+    """Test path policies match by longest prefix regardless of config order."""
+    config = Config(
+        path_sync_policy=[
+            PathSyncPolicy(prefix="/media", absent_retry_count=1),
+            PathSyncPolicy(prefix="/media/movies/new", absent_retry_count=3),
+            PathSyncPolicy(prefix="/media/movies", absent_retry_count=2),
+        ],
+    )
+
+    assert config.get_path_policy("/media/movies/new/film.mkv").absent_retry_count == 3
+    assert config.get_path_policy("/media/movies/old/film.mkv").absent_retry_count == 2
+    assert config.get_path_policy("/media/music/song.flac").absent_retry_count == 1
+    assert config.get_path_policy("/other/file.mkv") is None
+    assert config.get_path_policy(None) is None
+
+
+def test_config_get_path_policy_ignores_empty_prefix():
+    """Test a policy with an empty prefix never matches."""
+    config = Config(path_sync_policy=[PathSyncPolicy(prefix="", absent_retry_count=5)])
+
+    assert config.get_path_policy("/media/movies/film.mkv") is None
+
+
+def test_config_lookups_cannot_go_stale():
+    """Test servers and path policies can't be changed behind the lookup tables."""
+    config = Config(
+        servers=[ServerConfig(name="wan", url="http://wan:8096", api_key="key1")],
+        path_sync_policy=[PathSyncPolicy(prefix="/media", absent_retry_count=1)],
+    )
+
+    with pytest.raises(ValidationError):
+        config.servers = (ServerConfig(name="lan", url="http://lan:8096", api_key="key2"),)
+    with pytest.raises(ValidationError):
+        config.servers[0].name = "lan"
+    with pytest.raises(ValidationError):
+        config.path_sync_policy[0].prefix = "/other"
+    with pytest.raises(AttributeError):
+        config.path_sync_policy.append(PathSyncPolicy(prefix="/other"))  # type: ignore[attr-defined]
+
+    assert config.get_server("wan") is config.servers[0]
+    assert config.get_path_policy("/media/film.mkv") is config.path_sync_policy[0]
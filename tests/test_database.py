@@ -1,11 +1,18 @@
 """Tests for database operations."""
 
+import asyncio
+import contextlib
+import sqlite3
 import tempfile
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
 from pathlib import Path
+from unittest.mock import patch
 
+import aiosqlite
 import pytest
 
-from jellyfin_db_sync.database import Database
+from jellyfin_db_sync.database import ITEM_CACHE_INSERT_CHUNK, Database
 from jellyfin_db_sync.models import PendingEventStatus, SyncEventType
 
 
@@ -28,6 +35,183 @@ async def test_database_connection(db: Database):
     assert db._db is not None
 
 
+@pytest.mark.asyncio
+async def test_database_tuning_pragmas(db: Database):
+    """Test WAL connections get relaxed fsync, a larger cache and a busy timeout."""
+    assert db._db is not None
+
+    async def pragma(name: str) -> int:
+        assert db._db is not None
+        async with db._db.execute(f"PRAGMA {name}") as cursor:
+            row = await cursor.fetchone()
+        assert row is not None
+        return row[0]
+
+    assert await pragma("synchronous") == 1  # NORMAL
+    assert await pragma("cache_size") == -65536
+    assert await pragma("busy_timeout") == 5000
+    assert await pragma("temp_store") == 2  # MEMORY
+
+
+def test_database_pragmas_keep_sqlite_defaults_outside_wal():
+    """Test non-WAL journal modes keep full fsync and no mmap unless configured."""
+    pragmas = Database(":memory:", journal_mode="DELETE")._tuning_pragmas()
+
+    assert not any(p.startswith(("PRAGMA synchronous", "PRAGMA mmap_size")) for p in pragmas)
+
+
+@contextlib.asynccontextmanager
+async def _traced_sql(db: Database) -> AsyncIterator[list[str]]:
+    """Collect the statements the database runs on any of its connections (parameters inlined)."""
+    assert db._db is not None
+    statements: list[str] = []
+    connections = [db._db, *db._readers]
+    for connection in connections:
+        await connection.set_trace_callback(statements.append)
+    try:
+        yield statements
+    finally:
+        for connection in connections:
+            await connection.set_trace_callback(None)
+
+
+async def _query_plan(db: Database, statements: list[str], marker: str) -> str:
+    """Get the query plan of the one traced statement containing `marker`."""
+    assert db._db is not None
+    # Statements that fire triggers are traced again for each trigger program
+    [sql] = dict.fromkeys(s for s in statements if marker in s)
+    async with db._db.execute(f"EXPLAIN QUERY PLAN {sql}") as cursor:
+        return " ".join(row["detail"] for row in await cursor.fetchall())
+
+
+@pytest.mark.asyncio
+async def test_lookups_use_unique_indexes(db: Database):
+    """Test username and item path lookups are served by the UNIQUE constraint indexes."""
+    async with _traced_sql(db) as statements:
+        await db.get_user_mappings_by_username("a")
+    assert "sqlite_autoindex_user_mappings_1" in await _query_plan(db, statements, "FROM user_mappings")
+
+    async with _traced_sql(db) as statements:
+        await db.get_user_mapping("a", "wan")
+    assert "sqlite_autoindex_user_mappings_1" in await _query_plan(db, statements, "FROM user_mappings")
+
+    async with _traced_sql(db) as statements:
+        await db.get_cached_item_id("wan", "/a.mkv")
+    assert "sqlite_autoindex_item_path_cache_1" in await _query_plan(db, statements, "FROM item_path_cache")
+
+
+@pytest.mark.asyncio
+async def test_ready_event_queries_use_covering_index(db: Database):
+    """Test the claim subquery reads ready events in created_at order from the index alone."""
+    async with _traced_sql(db) as statements:
+        await db.claim_pending_events(limit=10)
+        await db.get_waiting_for_item_events(limit=10)
+
+    plan = await _query_plan(db, statements, "status = 'pending'")
+    assert "COVERING INDEX idx_pending_events_ready" in plan
+    assert "TEMP B-TREE" not in plan
+
+    # Item retries need whole rows, but still come from the index already in order
+    plan = await _query_plan(db, statements, "status = 'waiting_for_item'")
+    assert "idx_pending_events_ready" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_duplicate_event_check_is_an_index_probe(db: Database):
+    """Test has_pending_event's status IN list becomes equality probes on the dedup index, without the table."""
+    async with _traced_sql(db) as statements:
+        await db.has_pending_event(SyncEventType.WATCHED, "lan", "alice", "item-1")
+
+    assert (
+        "SEARCH pending_events USING COVERING INDEX idx_pending_events_dedup "
+        "(event_type=? AND target_server=? AND username=? AND item_id=? AND status=?)"
+    ) in await _query_plan(db, statements, "SELECT 1 FROM pending_events")
+
+
+@pytest.mark.asyncio
+async def test_processing_resets_only_visit_processing_rows(db: Database):
+    """Test startup and stale recovery updates are range searches on (status, updated_at)."""
+    for reset in (db.reset_all_processing, db.reset_stale_processing):
+        async with _traced_sql(db) as statements:
+            await reset()
+        plan = await _query_plan(db, statements, "UPDATE pending_events")
+        assert "SEARCH pending_events USING COVERING INDEX idx_pending_events_updated (status=?" in plan
+
+
+@pytest.mark.asyncio
+async def test_sync_log_filters_use_index(db: Database):
+    """Test filtered sync log queries search the filter index instead of scanning or sorting."""
+    async with _traced_sql(db) as statements:
+        await db.get_recent_sync_log(source_server="a", target_server="b")
+    assert "idx_sync_log_filters_created" in await _query_plan(db, statements, "SELECT COUNT(*)")
+
+    async with _traced_sql(db) as statements:
+        await db.get_recent_sync_log(
+            limit=10, since_minutes=60, source_server="a", target_server="b", event_type="watched"
+        )
+    plan = await _query_plan(db, statements, "ORDER BY created_at DESC")
+    assert "idx_sync_log_filters_created" in plan
+    assert "TEMP B-TREE" not in plan
+
+    # Filters on later columns are checked in the created_at index without reading rows
+    async with _traced_sql(db) as statements:
+        await db.get_recent_sync_log(since_minutes=60, event_type="watched")
+    assert "COVERING INDEX idx_sync_log_created_filters" in await _query_plan(db, statements, "SELECT COUNT(*)")
+
+    # Item name prefix search is a range scan on the NOCASE index
+    async with _traced_sql(db) as statements:
+        await db.get_recent_sync_log(item_name="office", item_name_prefix=True)
+    assert "idx_sync_log_item_name_nocase (item_name>? AND item_name<?)" in await _query_plan(
+        db, statements, "SELECT COUNT(*)"
+    )
+
+
+@pytest.mark.asyncio
+async def test_missing_columns_added_to_old_schema(tmp_path: Path):
+    """Test columns added in later versions are created on databases that lack them."""
+    db_path = tmp_path / "old.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE sync_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_type TEXT NOT NULL,
+                source_server TEXT NOT NULL,
+                target_server TEXT NOT NULL,
+                username TEXT NOT NULL,
+                item_id TEXT,
+                success BOOLEAN NOT NULL,
+                message TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+    database = Database(db_path)
+    await database.connect()
+    try:
+        assert database._db is not None
+        async with database._db.execute("PRAGMA table_info(sync_log)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        assert {"item_name", "synced_value"} <= columns
+    finally:
+        await database.close()
+
+
+@pytest.mark.asyncio
+async def test_database_size_from_page_count(db: Database):
+    """Test the size comes from SQLite's page count, including uncheckpointed WAL pages, and is cached briefly."""
+    assert db._db is not None
+    async with db._db.execute("SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size()") as cursor:
+        row = await cursor.fetchone()
+    assert await db.get_database_size() == row[0] > 0
+
+    await db.cache_items_batch("server1", [(f"/movies/{i}.mkv", f"item-{i}", "x" * 200) for i in range(500)])
+    assert await db.get_database_size() == row[0]  # cached
+    assert await db.get_database_size(max_age=0) > row[0]
+
+
 @pytest.mark.asyncio
 async def test_user_mapping_upsert(db: Database):
     """Test upserting user mappings."""
@@ -42,6 +226,16 @@ async def test_user_mapping_upsert(db: Database):
     assert mapping.jellyfin_user_id == "user-123"
 
 
+@pytest.mark.asyncio
+async def test_user_mapping_upsert_returns_updated_row(db: Database):
+    """Test upserting an existing mapping returns the same row with the new user ID."""
+    first = await db.upsert_user_mapping("testuser", "test-server", "user-123")
+    second = await db.upsert_user_mapping("testuser", "test-server", "user-456")
+
+    assert second.id == first.id
+    assert second.jellyfin_user_id == "user-456"
+
+
 @pytest.mark.asyncio
 async def test_user_mapping_get(db: Database):
     """Test getting user mappings."""
@@ -52,6 +246,369 @@ async def test_user_mapping_get(db: Database):
     assert len(mappings) == 2
 
 
+@pytest.mark.asyncio
+async def test_user_mappings_bulk_upsert(db: Database):
+    """Test bulk upsert inserts new rows and updates existing ones."""
+    await db.upsert_user_mapping("user1", "server1", "old-id")
+
+    await db.upsert_user_mappings([("user1", "server1", "id1"), ("user1", "server2", "id2")])
+    await db.upsert_user_mappings([])
+
+    mappings = await db.get_user_mappings_by_username("user1")
+    assert {m.server_name: m.jellyfin_user_id for m in mappings} == {"server1": "id1", "server2": "id2"}
+
+
+@pytest.mark.asyncio
+async def test_user_mapping_cache(db: Database):
+    """Test mapping lookups are cached and writes keep the cache consistent."""
+    await db.upsert_user_mapping("user1", "server1", "id1")
+    assert db._db is not None
+
+    with patch.object(db._db, "execute", wraps=db._db.execute) as execute:
+        mapping = await db.get_user_mapping("user1", "server1")
+        # Unchanged mapping from a webhook: served from cache, no write
+        await db.upsert_user_mappings([("user1", "server1", "id1")])
+    assert mapping is not None
+    assert mapping.jellyfin_user_id == "id1"
+    execute.assert_not_called()
+
+    await db.upsert_user_mappings([("user1", "server1", "id2")])
+    updated = await db.get_user_mapping("user1", "server1")
+    assert updated is not None
+    assert updated.jellyfin_user_id == "id2"
+
+    await db.delete_user_mapping("user1", "server1")
+    assert await db.get_user_mapping("user1", "server1") is None
+
+
+@pytest.mark.asyncio
+async def test_user_mapping_lookup_racing_a_write_is_not_cached(db: Database):
+    """Test a mapping row read before a delete doesn't end up in memory after the delete."""
+    assert db._db is not None
+    await db.upsert_user_mapping("user1", "server1", "id1")
+    db._mapping_cache.clear()
+    read, resume = asyncio.Event(), asyncio.Event()
+    execute = db._db.execute
+
+    class PausedCursor:
+        def __init__(self, row: object):
+            self.row = row
+
+        async def fetchone(self) -> object:
+            await resume.wait()
+            return self.row
+
+    @contextlib.asynccontextmanager
+    async def read_then_pause(*args: object) -> AsyncIterator[PausedCursor]:
+        async with execute(*args) as cursor:  # type: ignore[arg-type]
+            row = await cursor.fetchone()
+        read.set()
+        yield PausedCursor(row)
+
+    with patch.object(db._db, "execute", read_then_pause):
+        lookup = asyncio.create_task(db.get_user_mapping("user1", "server1"))
+        await read.wait()
+    await db.delete_user_mapping("user1", "server1")
+    resume.set()
+
+    assert await lookup is not None  # read before the delete
+    assert await db.get_user_mapping("user1", "server1") is None
+
+
+@pytest.mark.asyncio
+async def test_user_mappings_bulk_delete(db: Database):
+    """Test bulk delete removes only the listed mappings."""
+    await db.upsert_user_mappings(
+        [("user1", "server1", "id1"), ("user1", "server2", "id2"), ("user2", "server1", "id3")]
+    )
+
+    deleted = await db.delete_user_mappings([("user1", "server1"), ("user1", "server2"), ("user1", "missing")])
+
+    assert deleted == 2
+    assert await db.get_user_mappings_by_username("user1") == []
+    assert await db.delete_user_mappings([]) == 0
+
+
+async def _committed_mappings(db: Database) -> int:
+    """Count user mappings through a separate connection (committed rows only)."""
+    async with aiosqlite.connect(db.db_path) as other, other.execute("SELECT COUNT(*) FROM user_mappings") as cur:
+        row = await cur.fetchone()
+    assert row is not None
+    return row[0]
+
+
+@pytest.mark.asyncio
+async def test_batch_defers_commit_to_outermost_block(db: Database):
+    """Test writes inside batch() are committed once, when the outermost block exits."""
+    async with db.batch():
+        await db.upsert_user_mapping("user1", "server1", "id1")
+        async with db.batch():
+            await db.upsert_user_mapping("user1", "server2", "id2")
+        assert await _committed_mappings(db) == 0
+
+    assert await _committed_mappings(db) == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_belongs_to_its_task(db: Database):
+    """Test another task's write waits for an open batch and is committed when it returns."""
+    release = asyncio.Event()
+
+    async def hold_batch() -> None:
+        async with db.batch():
+            await db.upsert_user_mapping("user1", "server1", "id1")
+            await release.wait()
+
+    holder = asyncio.create_task(hold_batch())
+    await asyncio.sleep(0.05)
+    writer = asyncio.create_task(db.upsert_user_mapping("user2", "server1", "id2"))
+    await asyncio.sleep(0.05)
+    assert not writer.done()
+    assert await _committed_mappings(db) == 0
+
+    release.set()
+    await holder
+    await writer
+    assert await _committed_mappings(db) == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_rolls_back_on_error(db: Database):
+    """Test a batch that raises leaves no writes behind, in the table, the counters or the caches."""
+    await db.cache_item_path("server1", "/movies/a.mkv", "item-a")
+
+    with pytest.raises(RuntimeError):
+        async with db.batch():
+            await db.upsert_user_mapping("user1", "server1", "id1")
+            await db.cache_item_path("server1", "/movies/a.mkv", "item-b")
+            raise RuntimeError("boom")
+
+    assert await _committed_mappings(db) == 0
+    assert await db.get_user_mappings_count() == 0
+    assert await db.get_user_mapping("user1", "server1") is None
+    assert await db.get_cached_item_id("server1", "/movies/a.mkv") == "item-a"
+
+    # The connection is usable afterwards
+    await db.upsert_user_mapping("user1", "server1", "id1")
+    assert await _committed_mappings(db) == 1
+
+
+@pytest.mark.asyncio
+async def test_status_queries_use_read_only_connections(db: Database):
+    """Test counters are served by the read-only connections and see committed data."""
+    assert len(db._readers) == 2
+    assert db._reader() is not db._db
+
+    await db.upsert_user_mapping("user1", "server1", "id1")
+    assert await db.get_user_mappings_count() == 1
+
+    with pytest.raises(sqlite3.OperationalError):
+        await db._reader().execute("DELETE FROM user_mappings")
+
+
+@pytest.mark.asyncio
+async def test_reads_inside_batch_see_own_writes(db: Database):
+    """Test the task holding a batch reads its own writes; other tasks only see committed data."""
+    async with db.batch():
+        assert db._reader() is db._db
+        await db.upsert_user_mapping("user1", "server1", "id1")
+        await db.cache_items_batch("server1", [("/movies/a.mkv", "item-a", "A")])
+        assert await db.get_user_mappings_count() == 1
+        assert await db.get_cached_item_id("server1", "/movies/a.mkv") == "item-a"
+        assert await asyncio.create_task(db.get_user_mappings_count()) == 0  # not committed yet
+
+    assert db._reader() is not db._db
+    assert await db.get_user_mappings_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_item_path_lookups_use_read_only_connections(db: Database):
+    """Test item path cache lookups go through the readers and see committed cache entries."""
+    await db.cache_items_batch("server1", [("/movies/a.mkv", "item-a", "A")])
+
+    with patch.object(db, "_reader", wraps=db._reader) as reader:
+        assert await db.get_cached_item_id("server1", "/movies/a.mkv") == "item-a"
+    reader.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_queue_listings_see_uncommitted_status_changes(db: Database):
+    """Test pending-event listings don't return an event another task has claimed but not yet committed."""
+    event_id = await db.add_pending_event(
+        event_type=SyncEventType.WATCHED,
+        source_server="wan",
+        target_server="lan",
+        username="alice",
+        user_id="id-1",
+        item_id="item-1",
+        item_name="Item 1",
+        event_data={"is_played": True},
+    )
+    claimed = asyncio.Event()
+    release = asyncio.Event()
+
+    async def claim() -> None:
+        async with db.batch():
+            await db.mark_event_processing(event_id)
+            claimed.set()
+            await release.wait()
+
+    claimer = asyncio.create_task(claim())
+    await claimed.wait()
+    assert await db.get_pending_events() == []
+    release.set()
+    await claimer
+    assert await db.get_processing_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_item_path_lookup_during_pending_write_is_not_kept(db: Database):
+    """Test a lookup racing another task's uncommitted cache write doesn't pin the old item ID in memory."""
+    await db.cache_items_batch("server1", [("/movies/a.mkv", "item-a", "A")])
+    written = asyncio.Event()
+    release = asyncio.Event()
+
+    async def refresh() -> None:
+        async with db.batch():
+            await db.cache_items_batch("server1", [("/movies/a.mkv", "item-b", "A")])
+            written.set()
+            await release.wait()
+
+    refresher = asyncio.create_task(refresh())
+    await written.wait()
+    assert await db.get_cached_item_id("server1", "/movies/a.mkv") == "item-a"  # last committed value
+
+    release.set()
+    await refresher
+    assert await db.get_cached_item_id("server1", "/movies/a.mkv") == "item-b"
+
+
+@pytest.mark.asyncio
+async def test_item_path_lookup_after_refresh_sees_it(db: Database):
+    """Test a cache refresh made while another task holds a batch is committed before it returns."""
+    release = asyncio.Event()
+
+    async def hold_batch() -> None:
+        async with db.batch():
+            await db.upsert_user_mapping("user1", "server1", "id1")
+            await release.wait()
+
+    holder = asyncio.create_task(hold_batch())
+    await asyncio.sleep(0)
+    refresh = asyncio.create_task(db.cache_items_batch("server1", [("/movies/a.mkv", "item-a", "A")]))
+    await asyncio.sleep(0.05)
+    release.set()
+    await refresh
+    assert await db.get_cached_item_id("server1", "/movies/a.mkv") == "item-a"
+    await holder
+
+
+@pytest.mark.asyncio
+async def test_cache_items_batch_chunks(db: Database):
+    """Test large item batches are written in multi-row chunks plus a per-row remainder, upserting."""
+    count = ITEM_CACHE_INSERT_CHUNK * 2 + 7
+    items = [(f"/movies/{i}.mkv", f"item-{i}", f"Movie {i}") for i in range(count)]
+    assert await db.cache_items_batch("server1", items) == count
+    assert await db.get_item_cache_count("server1") == count
+
+    # Re-caching updates in place, for both the chunked and the remainder rows
+    updated = [(path, item_id + "-new", name) for path, item_id, name in items]
+    await db.cache_items_batch("server1", updated)
+    assert await db.get_item_cache_count("server1") == count
+    assert await db.get_cached_item_id("server1", "/movies/0.mkv") == "item-0-new"
+    assert await db.get_cached_item_id("server1", f"/movies/{count - 1}.mkv") == f"item-{count - 1}-new"
+
+
+@pytest.mark.asyncio
+async def test_item_path_memory_cache(db: Database):
+    """Test resolved item paths are answered from memory and dropped on every write."""
+    await db.cache_items_batch("server1", [("/movies/a.mkv", "item-a", "A")])
+    assert await db.get_cached_item_id("server1", "/movies/a.mkv") == "item-a"
+
+    with patch.object(db, "_reader", wraps=db._reader) as reader:
+        assert await db.get_cached_item_id("server1", "/movies/a.mkv") == "item-a"
+    reader.assert_not_called()
+
+    await db.cache_items_batch("server1", [("/movies/a.mkv", "item-b", "A")])
+    assert await db.get_cached_item_id("server1", "/movies/a.mkv") == "item-b"
+
+    await db.cache_item_path("server1", "/movies/a.mkv", "item-c")
+    assert await db.get_cached_item_id("server1", "/movies/a.mkv") == "item-c"
+
+    await db.invalidate_item_cache("server1", "/movies/a.mkv")
+    assert await db.get_cached_item_id("server1", "/movies/a.mkv") is None
+
+    await db.cache_item_path("server1", "/movies/a.mkv", "item-d")
+    await db.invalidate_item_cache("server1")
+    assert await db.get_cached_item_id("server1", "/movies/a.mkv") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidate_item_cache_by_prefix(db: Database):
+    """Test prefix invalidation removes only paths under the prefix, via the unique index range."""
+    paths = ["/tv/Show/s01e01.mkv", "/tv/Show/s01e02.mkv", "/tv/Show2/s01e01.mkv", "/tv/Shov.mkv", "/tv/Showz"]
+    await db.cache_items_batch("server1", [(p, f"id{i}", None) for i, p in enumerate(paths)])
+    await db.cache_items_batch("server2", [("/tv/Show/s01e01.mkv", "other", None)])
+    for server, path in [
+        ("server1", "/tv/Show/s01e01.mkv"),
+        ("server1", "/tv/Showz"),
+        ("server2", "/tv/Show/s01e01.mkv"),
+    ]:
+        assert await db.get_cached_item_id(server, path) is not None
+
+    async with _traced_sql(db) as statements:
+        assert await db.invalidate_item_cache("server1", path_prefix="/tv/Show/") == 2
+
+    # Only the matching paths leave the in-memory cache
+    assert db._item_path_cache.keys() == [("server1", "/tv/Showz"), ("server2", "/tv/Show/s01e01.mkv")]
+    assert await db.get_cached_item_id("server1", "/tv/Show/s01e01.mkv") is None
+    assert await db.get_cached_item_id("server1", "/tv/Show2/s01e01.mkv") == "id2"
+    assert await db.get_cached_item_id("server1", "/tv/Showz") == "id4"
+    assert await db.get_cached_item_id("server2", "/tv/Show/s01e01.mkv") == "other"
+
+    assert "item_path>? AND item_path<?" in await _query_plan(db, statements, "DELETE FROM item_path_cache")
+
+
+@pytest.mark.asyncio
+async def test_invalidate_item_cache_by_prefix_at_code_point_edges(db: Database):
+    """Test prefixes whose last character can't simply be bumped still match exactly their paths."""
+    top, before_surrogates = "\U0010ffff", "\ud7ff"
+    paths = [f"/a{top}/x", f"/a{top}", "/b", f"/c{before_surrogates}/x", "/c\ue000", f"{top}{top}/x"]
+    await db.cache_items_batch("server1", [(p, f"id{i}", None) for i, p in enumerate(paths)])
+
+    assert await db.invalidate_item_cache("server1", path_prefix=f"/a{top}") == 2
+    assert await db.invalidate_item_cache("server1", path_prefix=f"/c{before_surrogates}") == 1
+    assert await db.invalidate_item_cache("server1", path_prefix=f"{top}{top}") == 1
+
+    remaining = [p for p in paths if await db.get_cached_item_id("server1", p)]
+    assert remaining == ["/b", "/c\ue000"]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_database_has_no_readers():
+    """Test readers are only opened for file-backed databases (they'd see a different in-memory DB)."""
+    database = Database(":memory:")
+    await database.connect()
+    try:
+        assert database._readers == []
+        assert database._reader() is database._db
+    finally:
+        await database.close()
+
+
+@pytest.mark.asyncio
+async def test_user_server_ids(db: Database):
+    """Test user mappings pivoted to one row per username."""
+    await db.upsert_user_mapping("bob", "server1", "id-b1")
+    await db.upsert_user_mapping("alice", "server1", "id-a1")
+    await db.upsert_user_mapping("alice", "server2", "id-a2")
+
+    assert await db.get_user_server_ids() == [
+        ("alice", {"server1": "id-a1", "server2": "id-a2"}),
+        ("bob", {"server1": "id-b1"}),
+    ]
+
+
 @pytest.mark.asyncio
 async def test_pending_event_lifecycle(db: Database):
     """Test creating, getting, and completing pending events."""
@@ -92,6 +649,46 @@ async def test_pending_event_lifecycle(db: Database):
     assert processing_count == 0
 
 
+@pytest.mark.asyncio
+async def test_pending_event_timestamps_migrated_to_unix_ms(db: Database):
+    """Test TEXT timestamps from older databases are converted to integer milliseconds on connect."""
+    assert db._db is not None
+    event_id = await db.add_pending_event(
+        event_type=SyncEventType.WATCHED,
+        source_server="wan",
+        target_server="lan",
+        username="testuser",
+        user_id="user-123",
+        item_id="item-123",
+        item_name="Test Movie",
+        event_data={"is_played": True},
+    )
+    # Rewrite the row the way a pre-migration database stored it
+    await db._db.execute(
+        """
+        UPDATE pending_events
+        SET created_at = '2024-01-02 03:04:05', updated_at = '2024-01-02 03:04:05',
+            next_retry_at = '2024-01-02T03:04:06+00:00'
+        WHERE id = ?
+        """,
+        (event_id,),
+    )
+    await db._db.execute("PRAGMA user_version = 0")
+    await db._db.commit()
+    await db.close()
+
+    await db.connect()
+    assert db._db is not None
+    async with db._db.execute(
+        "SELECT created_at, updated_at, next_retry_at FROM pending_events WHERE id = ?", (event_id,)
+    ) as cursor:
+        row = await cursor.fetchone()
+    assert tuple(row) == (1704164645000, 1704164645000, 1704164646000)
+
+    events = await db.get_pending_events(limit=10)
+    assert events[0].created_at == datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC)
+
+
 @pytest.mark.asyncio
 async def test_sync_log(db: Database):
     """Test sync logging."""
@@ -114,6 +711,103 @@ async def test_sync_log(db: Database):
     assert entries[0]["success"] is True
 
 
+@pytest.mark.asyncio
+async def test_counters_track_writes(db: Database):
+    """Test trigger-maintained counters match COUNT(*) through inserts, upserts, status changes and deletes."""
+    assert db._db is not None
+    await db.upsert_user_mapping("alice", "server1", "id-1")
+    await db.upsert_user_mapping("alice", "server1", "id-2")  # update, not a new row
+    await db.upsert_user_mappings([("bob", "server1", "id-3"), ("carol", "server1", "id-4")])
+    await db.delete_user_mapping("carol", "server1")
+    await db.log_sync(SyncEventType.WATCHED.value, "wan", "lan", "user", "item1", True, "ok")
+
+    event_ids = [
+        await db.add_pending_event(
+            event_type=SyncEventType.WATCHED,
+            source_server="wan",
+            target_server="lan",
+            username="alice",
+            user_id="id-1",
+            item_id=f"item-{i}",
+            item_name=f"Item {i}",
+            event_data={"is_played": True},
+        )
+        for i in range(3)
+    ]
+    await db.claim_pending_events(limit=2)
+    await db.mark_event_completed(event_ids[0])  # also writes a sync_log row
+    await db.mark_event_waiting_for_item(event_ids[1], 3, 60, "not found")
+
+    assert await db.get_table_counts() == {"user_mappings": 2, "sync_log": 2}
+    assert await db.get_event_counts() == {"pending": 1, "waiting_for_item": 1}
+    assert await db.get_pending_count() == 1
+    assert await db.get_waiting_for_item_count() == 1
+    assert await db.get_processing_count() == 0
+
+    await db.cache_items_batch("server1", [(f"/m/{i}.mkv", f"id{i}", None) for i in range(3)])
+    await db.cache_item_path("server1", "/m/0.mkv", "id0b")  # upsert of an existing path
+    await db.cache_item_path("server2", "/m/0.mkv", "id0")
+    await db.invalidate_item_cache("server1", "/m/1.mkv")
+    assert await db.get_item_cache_stats() == {"server1": 2, "server2": 1}
+    assert await db.get_item_cache_count("server1") == 2
+    assert await db.get_item_cache_count() == 3
+    await db.invalidate_item_cache("server2")
+    assert await db.get_item_cache_stats() == {"server1": 2}
+
+    # Counters are rebuilt from the tables for databases that predate them
+    await db._db.execute("UPDATE counters SET value = 99")
+    await db._db.execute("PRAGMA user_version = 2")
+    await db._db.commit()
+    await db.close()
+    await db.connect()
+    assert await db.get_table_counts() == {"user_mappings": 2, "sync_log": 2}
+    assert await db.get_event_counts() == {"pending": 1, "waiting_for_item": 1}
+    assert await db.get_item_cache_stats() == {"server1": 2}
+
+
+@pytest.mark.asyncio
+async def test_sync_log_rows_written_in_one_batch(db: Database):
+    """Test queued sync_log rows are written by the background writer in one commit."""
+    assert db._db is not None
+    for i in range(5):
+        await db.log_sync(SyncEventType.WATCHED.value, "wan", "lan", "user", f"item{i}", True, "ok")
+
+    with patch.object(db._db, "commit", wraps=db._db.commit) as commit:
+        await db.flush_sync_log()
+    assert commit.call_count == 1
+    assert await db.get_sync_log_count() == 5
+
+
+@pytest.mark.asyncio
+async def test_sync_log_bad_row_does_not_drop_batch(db: Database):
+    """Test a row the database rejects is skipped and the rest of its batch is still written."""
+    await db.log_sync(SyncEventType.WATCHED.value, "wan", "lan", "user", "item1", True, "ok")
+    await db.log_sync(SyncEventType.WATCHED.value, "wan", "lan", None, "item2", True, "ok")  # type: ignore[arg-type]
+    await db.log_sync(SyncEventType.WATCHED.value, "wan", "lan", "user", "item3", True, "ok")
+
+    entries, total = await db.get_recent_sync_log()
+    assert total == 2
+    assert sorted(e["item_id"] for e in entries) == ["item1", "item3"]
+
+
+@pytest.mark.asyncio
+async def test_sync_log_follows_its_transaction(db: Database):
+    """Test rows logged inside batch() are written once it commits and dropped if it rolls back."""
+    with pytest.raises(RuntimeError):
+        async with db.batch():
+            await db.log_sync(SyncEventType.WATCHED.value, "wan", "lan", "user", "rolled-back", True, "ok")
+            with pytest.raises(RuntimeError):
+                await db.flush_sync_log()
+            raise RuntimeError("boom")
+
+    async with db.batch():
+        await db.log_sync(SyncEventType.WATCHED.value, "wan", "lan", "user", "committed", True, "ok")
+
+    entries, total = await db.get_recent_sync_log()
+    assert total == 1
+    assert entries[0]["item_id"] == "committed"
+
+
 @pytest.mark.asyncio
 async def test_sync_stats(db: Database):
     """Test sync statistics."""
@@ -1,5 +1,6 @@
 """Tests for Jellyfin API client."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
@@ -52,6 +53,28 @@ class TestClientInitialization:
         client = JellyfinClient(config)
         assert client.base_url == "http://jellyfin:8096"
 
+    @pytest.mark.asyncio
+    async def test_requests_limited_to_max_concurrency(self, server_config):
+        """Test that in-flight requests per client are capped."""
+        client = JellyfinClient(server_config, max_concurrency=2)
+        in_flight = 0
+        peak = 0
+
+        async def fake_request(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock()
+
+        http_client = MagicMock()
+        http_client.request = fake_request
+        with patch.object(client, "_get_client", new_callable=AsyncMock, return_value=http_client):
+            await asyncio.gather(*(client._request("GET", "/System/Info") for _ in range(6)))
+
+        assert peak == 2
+
 
 class TestUserOperations:
     """Test user-related API operations."""
@@ -134,6 +157,78 @@ class TestUserOperations:
 
         assert user_id is None
 
+    @pytest.mark.asyncio
+    async def test_ensure_user_creates(self, client):
+        """Test ensure_user creates a new user with a single request."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"Id": "user-new", "Name": "carol"}
+
+        with (
+            patch.object(client, "_request", new_callable=AsyncMock) as mock_request,
+            patch.object(client, "get_user_by_name", new_callable=AsyncMock) as mock_lookup,
+        ):
+            mock_request.return_value = mock_response
+
+            user, created = await client.ensure_user("carol", "secret")
+
+        assert created is True
+        assert user == {"Id": "user-new", "Name": "carol"}
+        mock_lookup.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ensure_user_existing(self, client):
+        """Test ensure_user falls back to lookup when the name is taken."""
+        with (
+            patch.object(client, "_request", new_callable=AsyncMock) as mock_request,
+            patch.object(client, "get_user_by_name", new_callable=AsyncMock) as mock_lookup,
+        ):
+            mock_request.side_effect = httpx.HTTPStatusError(
+                "Error",
+                request=MagicMock(),
+                response=MagicMock(status_code=400, text="A user with the name 'carol' already exists."),
+            )
+            mock_lookup.return_value = {"Id": "user-123", "Name": "carol"}
+
+            user, created = await client.ensure_user("carol", None)
+
+        assert created is False
+        assert user is not None
+        assert user["Id"] == "user-123"
+
+    @pytest.mark.asyncio
+    async def test_ensure_user_other_rejection(self, client):
+        """Test ensure_user treats a 400 that isn't a taken name as a failure."""
+        with (
+            patch.object(client, "_request", new_callable=AsyncMock) as mock_request,
+            patch.object(client, "get_user_by_name", new_callable=AsyncMock) as mock_lookup,
+        ):
+            mock_request.side_effect = httpx.HTTPStatusError(
+                "Error",
+                request=MagicMock(),
+                response=MagicMock(status_code=400, text="Usernames can contain unicode symbols, numbers (0-9)"),
+            )
+
+            user, created = await client.ensure_user("carol?", None)
+
+        assert (user, created) == (None, False)
+        mock_lookup.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ensure_user_server_error(self, client):
+        """Test ensure_user returns None on non-400 errors without a lookup."""
+        with (
+            patch.object(client, "_request", new_callable=AsyncMock) as mock_request,
+            patch.object(client, "get_user_by_name", new_callable=AsyncMock) as mock_lookup,
+        ):
+            mock_request.side_effect = httpx.HTTPStatusError(
+                "Error", request=MagicMock(), response=MagicMock(status_code=500)
+            )
+
+            user, created = await client.ensure_user("carol", None)
+
+        assert (user, created) == (None, False)
+        mock_lookup.assert_not_called()
+
 
 class TestItemLookup:
     """Test item lookup operations."""
@@ -148,6 +148,8 @@ class TestEventQueue:
         assert row["retry_count"] == 1
         assert row["last_error"] == "Connection timeout"
         assert row["status"] == "pending"
+        # First retry backs off 10s * 2^1
+        assert row["next_retry_at"] - row["updated_at"] == 20_000
 
     @pytest.mark.asyncio
     async def test_event_max_retries_exceeded(self, db: Database):
@@ -173,7 +175,8 @@ class TestEventQueue:
 
         # Update next_retry_at to now so we can process it
         await db._db.execute(
-            "UPDATE pending_events SET next_retry_at = ? WHERE id = ?", (datetime.now(UTC).isoformat(), event_id)
+            "UPDATE pending_events SET next_retry_at = ? WHERE id = ?",
+            (int(datetime.now(UTC).timestamp() * 1000), event_id),
         )
         await db._db.commit()
 
@@ -212,7 +215,7 @@ class TestEventQueue:
 
         # Simulate stale event (set updated_at to 10 minutes ago)
         # Use the same format as reset_stale_processing: "%Y-%m-%d %H:%M:%S"
-        stale_time = (datetime.now(UTC) - timedelta(minutes=10)).strftime("%Y-%m-%d %H:%M:%S")
+        stale_time = int((datetime.now(UTC) - timedelta(minutes=10)).timestamp() * 1000)
         await db._db.execute("UPDATE pending_events SET updated_at = ? WHERE id = ?", (stale_time, event_id))
         await db._db.commit()
 
@@ -268,6 +271,32 @@ class TestEventQueue:
         assert events[1].id == event2_id
         assert events[2].id == event3_id
 
+    @pytest.mark.asyncio
+    async def test_claim_pending_events(self, db: Database):
+        """Test claiming returns oldest events first, marks them processing, and never claims twice."""
+        event_ids = [
+            await db.add_pending_event(
+                event_type=SyncEventType.WATCHED,
+                source_server="wan",
+                target_server="lan",
+                username=f"user{i}",
+                user_id=f"u{i}",
+                item_id=f"item{i}",
+                item_name=f"Movie {i}",
+                event_data={},
+            )
+            for i in range(3)
+        ]
+
+        claimed = await db.claim_pending_events(limit=2)
+        assert [e.id for e in claimed] == event_ids[:2]
+        assert all(e.status == PendingEventStatus.PROCESSING for e in claimed)
+        assert await db.get_processing_count() == 2
+
+        remaining = await db.claim_pending_events(limit=10)
+        assert [e.id for e in remaining] == event_ids[2:]
+        assert await db.claim_pending_events(limit=10) == []
+
 
 class TestWaitingForItemEvents:
     """Test events waiting for item to be imported on target server."""
@@ -330,7 +359,7 @@ class TestWaitingForItemEvents:
         assert len(waiting) == 0
 
         # Set next_retry_at to past
-        past_time = (datetime.now(UTC) - timedelta(minutes=5)).isoformat()
+        past_time = int((datetime.now(UTC) - timedelta(minutes=5)).timestamp() * 1000)
         await db._db.execute("UPDATE pending_events SET next_retry_at = ? WHERE id = ?", (past_time, event_id))
         await db._db.commit()
 
@@ -373,6 +402,32 @@ class TestQueueStatistics:
 
         assert await db.get_pending_count() == 2
 
+    @pytest.mark.asyncio
+    async def test_event_and_table_counts(self, db: Database):
+        """Test grouped per-status event counts and combined table counts."""
+        assert await db.get_event_counts() == {}
+
+        event_ids = []
+        for i in range(3):
+            event_ids.append(
+                await db.add_pending_event(
+                    event_type=SyncEventType.WATCHED,
+                    source_server="wan",
+                    target_server="lan",
+                    username=f"user{i}",
+                    user_id=f"u{i}",
+                    item_id=f"item{i}",
+                    item_name=f"Movie {i}",
+                    event_data={},
+                )
+            )
+        await db.mark_event_processing(event_ids[0])
+        await db.upsert_user_mapping("user0", "wan", "u0")
+        await db.log_sync("watched", "wan", "lan", "user0", "item0", True, "ok")
+
+        assert await db.get_event_counts() == {"pending": 2, "processing": 1}
+        assert await db.get_table_counts() == {"user_mappings": 1, "sync_log": 1}
+
     @pytest.mark.asyncio
     async def test_sync_stats(self, db: Database):
         """Test sync statistics aggregation."""
@@ -404,6 +459,40 @@ class TestQueueStatistics:
         assert "watched" in event_types
         assert "favorite" in event_types
 
+        # Filtered totals are counted, unfiltered ones come from the row counter
+        entries, total = await db.get_recent_sync_log(limit=10, event_type="watched")
+        assert [e["event_type"] for e in entries] == ["watched"]
+        assert total == 1
+
+    @pytest.mark.asyncio
+    async def test_get_recent_sync_log_since_minutes(self, db: Database):
+        """Test the time window filter against CURRENT_TIMESTAMP-formatted created_at."""
+        await db.log_sync("watched", "wan", "lan", "user1", "old", True, "ok")
+        await db.log_sync("watched", "wan", "lan", "user1", "new", True, "ok")
+        await db.flush_sync_log()
+        await db._db.execute("UPDATE sync_log SET created_at = datetime('now', '-2 hours') WHERE item_id = 'old'")
+        await db._db.commit()
+
+        entries, total = await db.get_recent_sync_log(since_minutes=60)
+        assert [e["item_id"] for e in entries] == ["new"]
+        assert total == 1
+
+    @pytest.mark.asyncio
+    async def test_get_recent_sync_log_item_name_search(self, db: Database):
+        """Test substring and prefix item name filters, with LIKE wildcards matched literally."""
+        await db.log_sync("watched", "wan", "lan", "user1", "item1", True, "ok", item_name="The Office S01E01")
+        await db.log_sync("watched", "wan", "lan", "user1", "item2", True, "ok", item_name="Office Space")
+        await db.log_sync("watched", "wan", "lan", "user1", "item3", True, "ok", item_name="100% Wolf")
+
+        async def names(term: str, prefix: bool = False) -> set[object]:
+            entries, _ = await db.get_recent_sync_log(item_name=term, item_name_prefix=prefix)
+            return {e["item_name"] for e in entries}
+
+        assert await names("office") == {"The Office S01E01", "Office Space"}
+        assert await names("office", prefix=True) == {"Office Space"}
+        assert await names("100%", prefix=True) == {"100% Wolf"}
+        assert await names("1_0") == set()
+
 
 class TestProviderIdMatching:
     """Test events with provider IDs for matching."""
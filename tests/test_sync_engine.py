@@ -1,5 +1,7 @@
 """Tests for SyncEngine."""
 
+import asyncio
+import sqlite3
 import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -247,6 +249,28 @@ class TestEnqueueEvents:
 
         assert enqueued == 0
 
+    @pytest.mark.asyncio
+    async def test_enqueue_events_batch(self, test_config, db):
+        """Test a batch of webhooks is counted per webhook and deduplicated within the batch."""
+        engine = SyncEngine(test_config)
+
+        watched = WebhookPayload(
+            event="PlaybackStop",
+            user_id="user-123",
+            username="testuser",
+            item_id="item-456",
+            item_name="Test Movie",
+            played_to_completion=True,
+        )
+        other_user = watched.model_copy(update={"username": "otheruser", "user_id": "user-789"})
+
+        with patch("jellyfin_db_sync.sync.engine.get_db", return_value=db):
+            counts = await engine.enqueue_events_batch([(watched, "wan"), (watched, "wan"), (other_user, "wan")])
+
+        assert counts == [2, 0, 2]
+        assert len(await db.get_pending_events(limit=10)) == 4
+        assert await db.get_user_mapping("otheruser", "wan") is not None
+
 
 class TestSyncExecution:
     """Test sync execution logic."""
@@ -554,6 +578,96 @@ class TestQueueStatus:
         assert status["worker_running"] is False
 
 
+class TestServerUtilities:
+    """Test server-wide helpers (health checks, user discovery)."""
+
+    @pytest.mark.asyncio
+    async def test_cached_health_check_coalesces_callers(self, test_config):
+        """Concurrent and repeated health checks within the TTL share one probe round."""
+        engine = SyncEngine(test_config)
+        engine.health_check_all = AsyncMock(return_value={"wan": True, "lan": False})  # type: ignore[method-assign]
+
+        results = await asyncio.gather(*(engine.cached_health_check_all() for _ in range(5)))
+        again = await engine.cached_health_check_all()
+
+        assert all(r == {"wan": True, "lan": False} for r in results)
+        assert again == {"wan": True, "lan": False}
+        engine.health_check_all.assert_awaited_once()
+
+        # max_age=0 forces a fresh probe
+        await engine.cached_health_check_all(max_age=0)
+        assert engine.health_check_all.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_health_check_all_times_out_slow_server(self, test_config):
+        """Test a server that doesn't answer in time is reported unhealthy."""
+        engine = SyncEngine(test_config)
+
+        async def slow_health_check():
+            await asyncio.sleep(10)
+            return True
+
+        def make_client(server):
+            client = MagicMock()
+            client.health_check = slow_health_check if server.name == "lan" else AsyncMock(return_value=True)
+            return client
+
+        engine.get_client = MagicMock(side_effect=make_client)  # type: ignore[method-assign]
+
+        health = await engine.health_check_all(per_server_timeout=0.05)
+
+        assert health == {"wan": True, "lan": False, "backup": True}
+
+    @pytest.mark.asyncio
+    async def test_server_versions_time_out_and_are_cached(self, test_config):
+        """Test a slow server's version is None instead of stalling, and answered versions are reused."""
+        engine = SyncEngine(test_config)
+
+        async def slow_server_info():
+            await asyncio.sleep(10)
+            return {"Version": "10.9.0"}
+
+        clients = {}
+        for server in test_config.servers:
+            clients[server.name] = client = MagicMock()
+            if server.name == "lan":
+                client.get_server_info = MagicMock(side_effect=slow_server_info)
+            else:
+                client.get_server_info = AsyncMock(return_value={"Version": f"10.10.{len(server.name)}"})
+
+        engine.get_client = MagicMock(side_effect=lambda server: clients[server.name])  # type: ignore[method-assign]
+
+        versions = await engine.get_server_versions(per_server_timeout=0.05)
+        assert versions == {"wan": "10.10.3", "lan": None, "backup": "10.10.6"}
+
+        again = await engine.get_server_versions(per_server_timeout=0.05)
+        assert again == versions
+        clients["wan"].get_server_info.assert_awaited_once()
+        # The server that didn't answer is asked again
+        assert clients["lan"].get_server_info.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_all_users_skips_failing_server(self, test_config, db):
+        """Test user discovery keeps mappings from reachable servers when one fails."""
+        engine = SyncEngine(test_config)
+
+        def make_client(server):
+            client = MagicMock()
+            if server.name == "backup":
+                client.get_users = AsyncMock(side_effect=RuntimeError("connection refused"))
+            else:
+                client.get_users = AsyncMock(return_value=[{"Name": "Alice", "Id": f"{server.name}-alice"}])
+            return client
+
+        engine.get_client = MagicMock(side_effect=make_client)  # type: ignore[method-assign]
+
+        with patch("jellyfin_db_sync.sync.engine.get_db", return_value=db):
+            await engine.sync_all_users()
+
+        mappings = await db.get_user_mappings_by_username("alice")
+        assert {m.server_name: m.jellyfin_user_id for m in mappings} == {"wan": "wan-alice", "lan": "lan-alice"}
+
+
 class TestWorkerLifecycle:
     """Test background worker lifecycle."""
 
@@ -576,6 +690,76 @@ class TestWorkerLifecycle:
         assert engine._running is False
         assert engine._worker_task is None
 
+    @pytest.mark.asyncio
+    async def test_stop_worker_drains_inbox(self, test_config, db):
+        """Test that webhooks accepted into the inbox are queued before the worker stops."""
+        engine = SyncEngine(test_config)
+        payload = WebhookPayload(
+            event="PlaybackStop",
+            user_id="user-123",
+            username="testuser",
+            item_id="item-456",
+            item_name="Test Movie",
+            item_path="/movies/test.mkv",
+            played_to_completion=True,
+        )
+
+        with patch("jellyfin_db_sync.sync.engine.get_db", return_value=db):
+            await engine.start_worker(interval_seconds=60.0)
+            assert engine.submit_events(payload, "wan") is True
+            await engine.stop_worker()
+
+        # One WATCHED event for each of the two other servers
+        assert await db.get_pending_count() == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_inbox_batch_is_retried_per_webhook(self, test_config, db):
+        """Test that a failed batch write is retried per webhook without losing debounced progress."""
+        engine = SyncEngine(test_config)
+        webhooks = [
+            WebhookPayload(
+                event="PlaybackProgress",
+                user_id="user-123",
+                username="testuser",
+                item_id=item_id,
+                item_path=f"/movies/{item_id}.mkv",
+                playback_position_ticks=600_000_000,
+            )
+            for item_id in ("item-456", "item-789")
+        ]
+        add_pending_events = db.add_pending_events
+        calls = 0
+
+        async def failing_once(rows):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise sqlite3.OperationalError("database is locked")
+            await add_pending_events(rows)
+
+        with (
+            patch("jellyfin_db_sync.sync.engine.get_db", return_value=db),
+            patch.object(db, "add_pending_events", side_effect=failing_once),
+        ):
+            for payload in webhooks:
+                assert engine.submit_events(payload, "wan") is True
+            await engine.start_worker(interval_seconds=60.0)
+            await engine.stop_worker()
+
+        # The batch attempt failed, then each webhook was written on its own
+        assert calls == 3
+        # One PROGRESS event per webhook for each of the two other servers
+        assert await db.get_pending_count() == 4
+
+    def test_submit_events_rejects_when_inbox_full(self, test_config):
+        """Test that submit_events applies back-pressure once the inbox is full."""
+        test_config.sync.inbox_max_size = 1
+        engine = SyncEngine(test_config)
+        payload = WebhookPayload(event="PlaybackStop", username="testuser", item_id="item-456")
+
+        assert engine.submit_events(payload, "wan") is True
+        assert engine.submit_events(payload, "wan") is False
+
     @pytest.mark.asyncio
     async def test_double_start_worker(self, test_config, db):
         """Test that starting worker twice is safe."""
@@ -8,7 +8,7 @@ import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from jellyfin_db_sync.api.webhook import router
+from jellyfin_db_sync.api.webhook import get_username_skip_reason, router
 from jellyfin_db_sync.config import Config, DatabaseConfig, ServerConfig, SyncConfig
 from jellyfin_db_sync.database import Database
 from jellyfin_db_sync.sync import SyncEngine
@@ -59,6 +59,7 @@ def app_with_engine(test_config, db):
     # Create engine with mocked enqueue_events
     engine = MagicMock(spec=SyncEngine)
     engine.enqueue_events = AsyncMock(return_value=2)
+    engine.submit_events = MagicMock(return_value=True)
     engine.get_queue_status = AsyncMock(return_value={"pending_events": 5, "worker_running": True})
 
     app.state.engine = engine
@@ -66,6 +67,7 @@ def app_with_engine(test_config, db):
     # Patch get_config to return test config
     import jellyfin_db_sync.api.webhook as webhook_module
 
+    webhook_module._recent_webhooks.clear()
     original_get_config = webhook_module.get_config
     webhook_module.get_config = lambda: config
 
@@ -73,6 +75,29 @@ def app_with_engine(test_config, db):
 
     # Restore original
     webhook_module.get_config = original_get_config
+    webhook_module._recent_webhooks.clear()
+
+
+def test_webhook_router_routes():
+    """Test the webhook router exposes exactly the expected endpoints."""
+    from jellyfin_db_sync.api import webhook_router
+
+    routes = {(method, route.path) for route in webhook_router.routes for method in route.methods}
+    assert routes == {
+        ("POST", "/webhook/{server_name}"),
+        ("GET", "/webhook/test"),
+        ("GET", "/webhook/queue"),
+    }
+
+
+def test_generate_random_password():
+    """Test generated passwords have the requested length and use the password alphabet."""
+    from jellyfin_db_sync.api.webhook import PASSWORD_ALPHABET, generate_random_password
+
+    password = generate_random_password(24)
+    assert len(password) == 24
+    assert set(password) <= set(PASSWORD_ALPHABET)
+    assert generate_random_password() != generate_random_password()
 
 
 def test_webhook_test_endpoint(app_with_engine):
@@ -126,7 +151,7 @@ def test_webhook_valid_playback_stop(app_with_engine):
         "Provider_imdb": "tt1234567",
     }
 
-    response = client.post("/webhook/wan", json=payload)
+    response = client.post("/webhook/wan?await_enqueue=true", json=payload)
     assert response.status_code == 200
 
     data = response.json()
@@ -164,6 +189,50 @@ def test_webhook_skip_without_username(app_with_engine):
     engine.enqueue_events.assert_not_called()
 
 
+def test_webhook_skip_user_created_without_username(app_with_engine):
+    """Test user lifecycle webhooks without a username skip before any sync work."""
+    app, engine = app_with_engine
+    client = TestClient(app)
+
+    response = client.post("/webhook/wan", json={"NotificationType": "UserCreated", "UserId": "user-123"})
+    assert response.status_code == 200
+    assert response.json() == {"status": "skipped", "reason": "missing user info"}
+    engine.submit_events.assert_not_called()
+
+
+def test_get_username_skip_reason():
+    """Test the pre-validation username check only short-circuits clear skip cases."""
+    assert get_username_skip_reason(b'{"NotificationType": "PlaybackStop"}') == "no username"
+    assert get_username_skip_reason(b'{"NotificationType": "UserDeleted"}') == "missing username"
+    assert get_username_skip_reason(b'{"NotificationType": "PlaybackStop", "NotificationUsername": "bob"}') is None
+    # Bodies that aren't a JSON object with a string event are left to full validation (400)
+    assert get_username_skip_reason(b"not json") is None
+    assert get_username_skip_reason(b"[]") is None
+    assert get_username_skip_reason(b'{"NotificationType": 5}') is None
+    # Other fields aren't validated: a username-less body is skipped even if they are invalid
+    assert get_username_skip_reason(b'{"NotificationType": "PlaybackStop", "PlayCount": "abc"}') == "no username"
+
+
+def test_webhook_without_username_is_skipped_before_validation(app_with_engine):
+    """Test a username-less webhook is acknowledged as skipped even if other fields are invalid."""
+    app, engine = app_with_engine
+    client = TestClient(app)
+
+    body = b'{"NotificationType": "PlaybackStop", "PlayCount": "abc"}'
+    response = client.post("/webhook/wan", content=body, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "skipped", "reason": "no username"}
+    engine.submit_events.assert_not_called()
+    # With a username the same field is validated and rejected
+    response = client.post(
+        "/webhook/wan",
+        content=b'{"NotificationType": "PlaybackStop", "NotificationUsername": "bob", "PlayCount": "abc"}',
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 400
+
+
 def test_webhook_invalid_payload(app_with_engine):
     """Test webhook with invalid JSON payload."""
     app, _ = app_with_engine
@@ -214,7 +283,8 @@ def test_webhook_user_data_saved(app_with_engine):
 
     response = client.post("/webhook/wan", json=payload)
     assert response.status_code == 200
-    assert response.json()["status"] == "enqueued"
+    assert response.json()["status"] == "accepted"
+    engine.submit_events.assert_called_once()
 
 
 def test_webhook_playback_progress(app_with_engine):
@@ -237,4 +307,218 @@ def test_webhook_playback_progress(app_with_engine):
 
     response = client.post("/webhook/wan", json=payload)
     assert response.status_code == 200
-    assert response.json()["status"] == "enqueued"
+    assert response.json()["status"] == "accepted"
+    engine.submit_events.assert_called_once()
+
+
+def test_webhook_inbox_full_returns_503(app_with_engine):
+    """Test webhook is rejected with 503 when the engine inbox is full."""
+    app, engine = app_with_engine
+    engine.submit_events.return_value = False
+    client = TestClient(app)
+
+    payload = {
+        "NotificationType": "PlaybackStop",
+        "UserId": "user-123",
+        "NotificationUsername": "testuser",
+        "ItemId": "item-456",
+        "Name": "Test Movie",
+        "Path": "/movies/test.mkv",
+        "PlayedToCompletion": True,
+    }
+
+    response = client.post("/webhook/wan", json=payload)
+    assert response.status_code == 503
+    engine.enqueue_events.assert_not_called()
+
+
+def test_webhook_duplicate_delivery_is_deduped(app_with_engine):
+    """Test identical redeliveries are acknowledged once and then dropped."""
+    app, engine = app_with_engine
+    client = TestClient(app)
+
+    payload = {
+        "NotificationType": "ItemAdded",
+        "UserId": "user-123",
+        "NotificationUsername": "testuser",
+        "ItemId": "item-456",
+        "Name": "Test Movie",
+        "Path": "/movies/test.mkv",
+    }
+
+    first = client.post("/webhook/wan", json=payload)
+    second = client.post("/webhook/wan", json=payload)
+    other_server = client.post("/webhook/lan", json=payload)
+
+    assert first.json() == {"status": "accepted"}
+    assert second.json() == {"status": "deduped"}
+    assert other_server.json() == {"status": "accepted"}
+    assert engine.submit_events.call_count == 2
+
+
+def test_webhook_toggle_back_is_not_deduped(app_with_engine):
+    """Test played -> unplayed -> played within the TTL applies every change."""
+    app, engine = app_with_engine
+    client = TestClient(app)
+
+    payload = {
+        "NotificationType": "UserDataSaved",
+        "UserId": "user-123",
+        "NotificationUsername": "testuser",
+        "ItemId": "item-456",
+        "Path": "/movies/test.mkv",
+        "Played": True,
+    }
+
+    played = client.post("/webhook/wan", json=payload)
+    unplayed = client.post("/webhook/wan", json={**payload, "Played": False})
+    played_again = client.post("/webhook/wan", json=payload)
+
+    assert [r.json() for r in (played, unplayed, played_again)] == [{"status": "accepted"}] * 3
+    assert engine.submit_events.call_count == 3
+
+
+def test_webhook_rejected_delivery_is_not_deduped(app_with_engine):
+    """Test a retry after a 503 is processed rather than dropped as a duplicate."""
+    app, engine = app_with_engine
+    engine.submit_events = MagicMock(side_effect=[False, True])
+    client = TestClient(app)
+
+    payload = {
+        "NotificationType": "ItemAdded",
+        "NotificationUsername": "testuser",
+        "ItemId": "item-456",
+        "Path": "/movies/test.mkv",
+    }
+
+    assert client.post("/webhook/wan", json=payload).status_code == 503
+    assert client.post("/webhook/wan", json=payload).json() == {"status": "accepted"}
+
+
+def test_webhook_item_enrichment_is_cached(app_with_engine):
+    """Test repeated webhooks for the same item reuse the enrichment lookup."""
+    import jellyfin_db_sync.api.webhook as webhook_module
+
+    webhook_module._item_info_cache.clear()
+    app, engine = app_with_engine
+    jellyfin_client = MagicMock()
+    jellyfin_client.server = ServerConfig(name="wan", url="http://wan:8096", api_key="key1")
+    jellyfin_client.get_item_info = AsyncMock(
+        return_value={"Path": "/movies/test.mkv", "ProviderIds": {"Imdb": "tt1234567"}}
+    )
+    engine.get_client = MagicMock(return_value=jellyfin_client)
+    client = TestClient(app)
+
+    payload: dict[str, object] = {
+        "NotificationType": "PlaybackProgress",
+        "UserId": "user-123",
+        "NotificationUsername": "testuser",
+        "ItemId": "item-456",
+        "Name": "Test Movie",
+    }
+
+    for i in range(3):
+        payload["PlaybackPositionTicks"] = 36000000000 + i * 100000000
+        response = client.post("/webhook/wan", json=payload)
+        assert response.status_code == 200
+
+    jellyfin_client.get_item_info.assert_awaited_once()
+    submitted_payload = engine.submit_events.call_args[0][0]
+    assert submitted_payload.item_path == "/movies/test.mkv"
+    assert submitted_payload.provider_imdb == "tt1234567"
+    webhook_module._item_info_cache.clear()
+
+
+def test_webhook_item_deleted_invalidates_item_cache(app_with_engine):
+    """Test ItemDeleted drops the cached identity for that server's item only."""
+    import jellyfin_db_sync.api.webhook as webhook_module
+
+    webhook_module._item_info_cache.clear()
+    app, engine = app_with_engine
+    identity = webhook_module.ItemIdentity(path="/movies/test.mkv", imdb=None, tmdb=None, tvdb=None)
+    webhook_module._item_info_cache.set(("wan", "item-456"), identity)
+    webhook_module._item_info_cache.set(("lan", "item-456"), identity)
+    client = TestClient(app)
+
+    response = client.post("/webhook/wan", json={"NotificationType": "ItemDeleted", "ItemId": "item-456"})
+
+    assert response.json() == {"status": "skipped", "reason": "item deleted"}
+    assert webhook_module._item_info_cache.get(("wan", "item-456")) is None
+    assert webhook_module._item_info_cache.get(("lan", "item-456")) == identity
+    engine.submit_events.assert_not_called()
+    webhook_module._item_info_cache.clear()
+
+
+async def test_sync_user_creation_creates_without_lookup(test_config, db, monkeypatch):
+    """Each server gets a single ensure_user call; existing users are mapped and reported as skipped."""
+    import jellyfin_db_sync.api.webhook as webhook_module
+
+    base_config, _ = test_config
+    config = Config(
+        servers=[*base_config.servers, ServerConfig(name="backup", url="http://backup:8096", api_key="key3")],
+        database=base_config.database,
+    )
+    clients = {}
+
+    def make_client(server):
+        client = MagicMock()
+        client.get_user_by_name = AsyncMock()
+        client.ensure_user = AsyncMock(return_value=({"Id": f"{server.name}-id"}, server.name == "backup"))
+        clients[server.name] = client
+        return client
+
+    async def get_test_db():
+        return db
+
+    monkeypatch.setattr(webhook_module, "get_config", lambda: config)
+    monkeypatch.setattr(webhook_module, "get_db", get_test_db)
+    monkeypatch.setattr(webhook_module, "generate_random_password", MagicMock(return_value="generated"))
+    engine = MagicMock(spec=SyncEngine)
+    engine.get_client = MagicMock(side_effect=make_client)
+
+    results = await webhook_module.sync_user_creation(engine, "wan", "testuser", "wan-id")
+
+    assert results["skipped"] == ["lan"]
+    assert results["created"] == [{"server": "backup", "passwordless": False, "password": "generated"}]
+    for name in ("lan", "backup"):
+        clients[name].ensure_user.assert_awaited_once_with("testuser", "generated")
+        clients[name].get_user_by_name.assert_not_called()
+    mapped = {m.server_name: m.jellyfin_user_id for m in await db.get_user_mappings_by_username("testuser")}
+    assert mapped == {"wan": "wan-id", "lan": "lan-id", "backup": "backup-id"}
+
+
+async def test_sync_user_deletion_isolates_server_failures(test_config, db, monkeypatch):
+    """A server raising during user deletion is reported as failed without aborting the others."""
+    import jellyfin_db_sync.api.webhook as webhook_module
+
+    base_config, _ = test_config
+    config = Config(
+        servers=[*base_config.servers, ServerConfig(name="backup", url="http://backup:8096", api_key="key3")],
+        database=base_config.database,
+    )
+
+    def make_client(server):
+        client = MagicMock()
+        if server.name == "backup":
+            client.get_user_by_name = AsyncMock(side_effect=RuntimeError("connection refused"))
+        else:
+            client.get_user_by_name = AsyncMock(return_value={"Id": f"{server.name}-id"})
+        client.delete_user = AsyncMock(return_value=True)
+        return client
+
+    async def get_test_db():
+        return db
+
+    monkeypatch.setattr(webhook_module, "get_config", lambda: config)
+    monkeypatch.setattr(webhook_module, "get_db", get_test_db)
+    engine = MagicMock(spec=SyncEngine)
+    engine.get_client = MagicMock(side_effect=make_client)
+    await db.upsert_user_mappings([("testuser", name, f"{name}-id") for name in ("wan", "lan", "backup")])
+
+    results = await webhook_module.sync_user_deletion(engine, "wan", "testuser")
+
+    assert results["deleted"] == ["wan", "lan"]
+    assert results["not_found"] == []
+    assert results["failed"] == ["backup"]
+    # Mappings are removed only where the user is gone
+    assert [m.server_name for m in await db.get_user_mappings_by_username("testuser")] == ["backup"]